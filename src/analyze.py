@@ -2,6 +2,7 @@
 データ分析スクリプト
 収集したYouTubeデータを加工・分析する
 """
+import csv
 import re
 
 import pandas as pd
@@ -165,7 +166,9 @@ def detect_spam_comments(df_comments):
     # 長いコメントのみ対象（計算量削減）
     long_comments = df[df["text"].str.len() >= 30]
     if len(long_comments) > 1:
-        trigram_cache = {idx: char_trigrams(row["text"]) for idx, row in long_comments.iterrows()}
+        trigram_cache = {
+            idx: char_trigrams(text) for idx, text in zip(long_comments.index, long_comments["text"])
+        }
         checked = set()
         for idx_a, tg_a in trigram_cache.items():
             if not tg_a:
@@ -395,8 +398,14 @@ def run_analysis():
     processed_dir = DATA_DIR / "processed"
     processed_dir.mkdir(parents=True, exist_ok=True)
 
-    daily_counts.to_csv(processed_dir / "daily_video_counts.csv", index=False)
-    daily_views.to_csv(processed_dir / "daily_views.csv", index=False)
+    daily_counts.to_csv(
+        processed_dir / "daily_video_counts.csv", index=False,
+        quoting=csv.QUOTE_NONE, lineterminator="\n",
+    )
+    daily_views.to_csv(
+        processed_dir / "daily_views.csv", index=False,
+        quoting=csv.QUOTE_NONE, lineterminator="\n",
+    )
     issue_stats.to_csv(
         processed_dir / "issue_stats.csv", index=False, encoding="utf-8-sig"
     )
@@ -406,7 +415,10 @@ def run_analysis():
     party_video_stats.to_csv(
         processed_dir / "party_video_stats.csv", index=False, encoding="utf-8-sig"
     )
-    sentiment_counts.to_csv(processed_dir / "sentiment_counts.csv", index=False)
+    sentiment_counts.to_csv(
+        processed_dir / "sentiment_counts.csv", index=False,
+        quoting=csv.QUOTE_NONE, lineterminator="\n",
+    )
     df_comments.to_csv(
         processed_dir / "comments_with_sentiment.csv",
         index=False,
@@ -15,6 +15,13 @@ PROCESSED_DIR = DATA_DIR / "processed"
 
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
 
+# サンプルデータの processed 出力形式（"csv" または "parquet"。parquet は CSV に加えて同名の .parquet も書く。pyarrow が必要）
+SAMPLE_EXPORT_FORMAT = os.getenv("SAMPLE_EXPORT_FORMAT", "csv")
+
+# 可視化グラフの画像形式（FIGURE_FORMATS のいずれか。大文字小文字は問わない）
+FIGURE_FORMATS = ("webp", "png")
+FIGURE_FORMAT = os.getenv("FIGURE_FORMAT", "webp").strip().lower()
+
 # 選挙関連の検索キーワード
 SEARCH_QUERIES = [
     "衆院選 2026",
@@ -265,6 +272,23 @@ REGIONAL_PARTY_STRENGTH = {
     },
 }
 
+
+
+def _national_avg_strength(party):
+    """政党の地域強度の全地域平均（データのない地域は 0.02）"""
+    return sum(r.get(party, 0.02) for r in REGIONAL_PARTY_STRENGTH.values()) / len(
+        REGIONAL_PARTY_STRENGTH
+    )
+
+
+# 政党別の地域強度の全地域平均（地域補正用）。どの地域にもない政党は NATIONAL_AVG_DEFAULT
+NATIONAL_AVG_BY_PARTY = {
+    party: _national_avg_strength(party)
+    for profile in REGIONAL_PARTY_STRENGTH.values()
+    for party in profile
+}
+NATIONAL_AVG_DEFAULT = _national_avg_strength(None)
+
 # 都道府県 → 地域タイプ
 PREFECTURE_REGION_TYPE = {
     1: "hokkaido",
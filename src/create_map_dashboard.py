@@ -50,9 +50,13 @@ for _code, _name in PREFECTURE_NAMES.items():
     PREF_SHORT_TO_CODE[_short] = _code
 
 
+# 選挙区名 '北海道1区' → ('北海道', '1')
+_DISTRICT_RE = re.compile(r"^(.+?)(\d+)区$")
+
+
 def _parse_district_name(district_name):
     """'北海道1区' → (prefecture_code, district_number)"""
-    m = re.match(r"^(.+?)(\d+)区$", district_name)
+    m = _DISTRICT_RE.match(district_name)
     if not m:
         return None, None
     return PREF_SHORT_TO_CODE.get(m.group(1)), int(m.group(2))
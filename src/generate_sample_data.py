@@ -2,9 +2,12 @@
 サンプルデータ生成スクリプト
 APIキーがなくても可視化のデモを実行できるようにする
 """
+import csv
+import io
 import random
 from datetime import datetime, timedelta
 
+import numpy as np
 import pandas as pd
 
 from config import (
@@ -13,9 +16,11 @@ from config import (
     REGIONAL_PARTY_STRENGTH,
     PREFECTURE_REGION_TYPE,
     PR_BLOCK_PREFECTURES,
+    SAMPLE_EXPORT_FORMAT,
 )
 
 random.seed(42)
+_rng = np.random.default_rng(42)
 
 PARTIES = ["自由民主党", "日本維新の会", "立憲民主党", "国民民主党", "日本共産党", "れいわ新選組", "参政党", "チームみらい"]
 ISSUES = ["消費税・物価高", "安全保障", "移民・外国人", "経済政策", "社会保障", "政治改革", "その他"]
@@ -46,54 +51,57 @@ SAMPLE_TITLES = [
 ]
 
 
-def generate_video_details():
-    """動画詳細のサンプルデータ"""
-    rows = []
+def generate_video_details(n_videos=200):
+    """動画詳細のサンプルデータ（NumPy RNGで全行を一括生成）"""
     base_date = datetime(2026, 1, 1)
 
-    for i in range(200):
-        pub_date = base_date + timedelta(
-            days=random.randint(0, 38),
-            hours=random.randint(0, 23),
-            minutes=random.randint(0, 59),
-        )
+    days = _rng.integers(0, 39, n_videos)
+    pub_dates = (
+        pd.Timestamp(base_date)
+        + pd.to_timedelta(days, unit="D")
+        + pd.to_timedelta(_rng.integers(0, 24, n_videos), unit="h")
+        + pd.to_timedelta(_rng.integers(0, 60, n_videos), unit="m")
+    )
 
-        # 選挙公示後（1/27以降）は投稿数が増加
-        days_from_start = (pub_date - base_date).days
-        view_multiplier = 1.0 + max(0, (days_from_start - 26)) * 0.3
+    # 選挙公示後（1/27以降）は投稿数が増加
+    view_multiplier = 1.0 + np.maximum(0, days - 26) * 0.3
 
-        views = int(random.lognormvariate(10, 1.5) * view_multiplier)
-        likes = int(views * random.uniform(0.01, 0.08))
-        comments = int(views * random.uniform(0.002, 0.02))
+    views = (_rng.lognormal(10, 1.5, n_videos) * view_multiplier).astype(np.int64)
+    likes = (views * _rng.uniform(0.01, 0.08, n_videos)).astype(np.int64)
+    comments = (views * _rng.uniform(0.002, 0.02, n_videos)).astype(np.int64)
 
-        party = random.choice(PARTIES + ["個人"] * 5)
-        title = random.choice(SAMPLE_TITLES)
-        if party != "個人":
-            title = f"【{party}】{title}"
+    parties = _rng.choice(PARTIES + ["個人"] * 5, n_videos)
+    titles = _rng.choice(SAMPLE_TITLES, n_videos)
+    is_party = parties != "個人"
 
-        # 政党動画は政党チャンネルIDを使用（analyze_channelsとの整合性）
-        if party != "個人":
-            channel_id = f"ch_{party}"
-            channel_title = f"{party}公式チャンネル"
-        else:
-            channel_id = f"ch_{i % 50:03d}"
-            channel_title = f"チャンネル{i % 50}"
+    # 政党動画は政党チャンネルIDを使用（analyze_channelsとの整合性）
+    idx = np.arange(n_videos)
+    titles = np.where(is_party, "【" + parties + "】" + titles, titles)
+    channel_ids = np.where(
+        is_party, "ch_" + parties, [f"ch_{i % 50:03d}" for i in idx]
+    )
+    channel_titles = np.where(
+        is_party, parties + "公式チャンネル", [f"チャンネル{i % 50}" for i in idx]
+    )
 
-        rows.append({
-            "video_id": f"sample_{i:04d}",
-            "title": title,
-            "channel_id": channel_id,
-            "channel_title": channel_title,
-            "published_at": pub_date.isoformat() + "Z",
-            "tags": [],
-            "category_id": "25",
-            "duration": f"PT{random.randint(3, 120)}M{random.randint(0,59)}S",
-            "view_count": views,
-            "like_count": likes,
-            "comment_count": comments,
-        })
+    durations = [
+        f"PT{m}M{sec}S"
+        for m, sec in zip(_rng.integers(3, 121, n_videos), _rng.integers(0, 60, n_videos))
+    ]
 
-    return pd.DataFrame(rows)
+    return pd.DataFrame({
+        "video_id": [f"sample_{i:04d}" for i in idx],
+        "title": titles,
+        "channel_id": channel_ids,
+        "channel_title": channel_titles,
+        "published_at": pub_dates,
+        "tags": [[] for _ in idx],
+        "category_id": "25",
+        "duration": durations,
+        "view_count": views,
+        "like_count": likes,
+        "comment_count": comments,
+    })
 
 
 def generate_comments():
@@ -139,32 +147,34 @@ def generate_comments():
         "です", "ですね", "…", "。。。", "w", "💪", "👍",
     ]
 
-    rows = []
-    for i in range(500):
-        templates = random.choices(
-            [positive_templates, negative_templates, neutral_templates],
-            weights=[0.3, 0.3, 0.4],
-        )[0]
-
-        pub_date = datetime(2026, 1, 15) + timedelta(
-            days=random.randint(0, 24),
-            hours=random.randint(0, 23),
-        )
+    n_comments = 500
+    template_groups = [positive_templates, negative_templates, neutral_templates]
+    group = _rng.choice(len(template_groups), n_comments, p=[0.3, 0.3, 0.4])
+    pick = _rng.random(n_comments)
+    suffix = _rng.choice(suffixes, n_comments)
 
-        # テンプレートにランダムなサフィックスを付加してユニーク化
-        text = random.choice(templates) + random.choice(suffixes)
+    # テンプレートにランダムなサフィックスを付加してユニーク化
+    texts = [
+        template_groups[g][int(u * len(template_groups[g]))] + sfx
+        for g, u, sfx in zip(group, pick, suffix)
+    ]
 
-        # 全200動画に分散（0-19ではなく0-199）
-        rows.append({
-            "video_id": f"sample_{random.randint(0, 199):04d}",
-            "comment_id": f"comment_{i:05d}",
-            "author": f"ユーザー{i}",
-            "text": text,
-            "like_count": random.randint(0, 200),
-            "published_at": pub_date.isoformat() + "Z",
-        })
+    pub_dates = (
+        pd.Timestamp(2026, 1, 15)
+        + pd.to_timedelta(_rng.integers(0, 25, n_comments), unit="D")
+        + pd.to_timedelta(_rng.integers(0, 24, n_comments), unit="h")
+    )
 
-    return pd.DataFrame(rows)
+    idx = np.arange(n_comments)
+    # 全200動画に分散（0-19ではなく0-199）
+    return pd.DataFrame({
+        "video_id": [f"sample_{v:04d}" for v in _rng.integers(0, 200, n_comments)],
+        "comment_id": [f"comment_{i:05d}" for i in idx],
+        "author": [f"ユーザー{i}" for i in idx],
+        "text": texts,
+        "like_count": _rng.integers(0, 201, n_comments),
+        "published_at": pub_dates.strftime("%Y-%m-%dT%H:%M:%SZ"),
+    })
 
 
 def generate_channel_stats():
@@ -180,19 +190,19 @@ def generate_channel_stats():
         "チームみらい": {"subscribers": 63000, "videos": 450, "views": 4000000},
     }
 
-    rows = []
-    for party, stats in data.items():
-        rows.append({
-            "channel_id": f"ch_{party}",
-            "channel_title": f"{party}公式チャンネル",
-            "party_name": party,
-            "subscriber_count": stats["subscribers"] + random.randint(-5000, 5000),
-            "video_count": stats["videos"] + random.randint(-50, 50),
-            "view_count": stats["views"] + random.randint(-1000000, 1000000),
-            "collected_at": datetime.now().isoformat(),
-        })
+    parties = list(data)
+    n = len(parties)
+    base = pd.DataFrame.from_dict(data, orient="index")
 
-    return pd.DataFrame(rows)
+    return pd.DataFrame({
+        "channel_id": [f"ch_{party}" for party in parties],
+        "channel_title": [f"{party}公式チャンネル" for party in parties],
+        "party_name": parties,
+        "subscriber_count": base["subscribers"].to_numpy() + _rng.integers(-5000, 5001, n),
+        "video_count": base["videos"].to_numpy() + _rng.integers(-50, 51, n),
+        "view_count": base["views"].to_numpy() + _rng.integers(-1000000, 1000001, n),
+        "collected_at": datetime.now().isoformat(),
+    })
 
 
 def generate_media_channels():
@@ -633,6 +643,27 @@ def generate_prefecture_summary():
     return pd.DataFrame(rows)
 
 
+# これを超える行数の出力はメモリ上に全文を組み立てず pandas の直接書き込みに任せる
+_CSV_BUFFER_MAX_ROWS = 100_000
+
+
+def _write_processed(df, processed_dir, name, encoding="utf-8", **csv_kwargs):
+    """processed ディレクトリへ CSV を書き出す（SAMPLE_EXPORT_FORMAT=parquet なら同名の .parquet も書く）
+
+    後段のスクリプトは CSV を読むので、CSV は形式によらず必ず書く。
+    CSV はメモリ上で全文を組み立ててから一度の write で保存する
+    """
+    path = processed_dir / f"{name}.csv"
+    if len(df) > _CSV_BUFFER_MAX_ROWS:
+        df.to_csv(path, index=False, encoding=encoding, **csv_kwargs)
+    else:
+        buf = io.StringIO()
+        df.to_csv(buf, index=False, **csv_kwargs)
+        path.write_bytes(buf.getvalue().encode(encoding))
+    if SAMPLE_EXPORT_FORMAT == "parquet":
+        df.to_parquet(processed_dir / f"{name}.parquet", index=False)
+
+
 def generate_all_sample_data():
     """全サンプルデータを生成"""
     print("サンプルデータを生成中...")
@@ -643,7 +674,10 @@ def generate_all_sample_data():
     timestamp = "sample"
 
     df_details = generate_video_details()
-    df_details.to_csv(
+    # 生データCSVはAPIと同じISO 8601 (UTC "Z") 文字列で出力する
+    df_details.assign(
+        published_at=df_details["published_at"].dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+    ).to_csv(
         raw_dir / f"video_details_{timestamp}.csv", index=False, encoding="utf-8-sig"
     )
 
@@ -661,15 +695,20 @@ def generate_all_sample_data():
     processed_dir = DATA_DIR / "processed"
     processed_dir.mkdir(parents=True, exist_ok=True)
 
-    # 日別投稿数
-    df_details["published_at"] = pd.to_datetime(df_details["published_at"])
-    df_details["date"] = df_details["published_at"].dt.date
-    daily_counts = df_details.groupby("date").size().reset_index(name="video_count")
-    daily_counts.to_csv(processed_dir / "daily_video_counts.csv", index=False)
+    # 日別投稿数（メモリ上の datetime 列から直接集計し、CSVの再読込・再パースはしない）
+    by_date = df_details.groupby(df_details["published_at"].dt.date.rename("date"))
+    daily_counts = by_date.size().reset_index(name="video_count")
+    _write_processed(
+        daily_counts, processed_dir, "daily_video_counts",
+        quoting=csv.QUOTE_NONE, lineterminator="\n",
+    )
 
     # 日別再生回数
-    daily_views = df_details.groupby("date")["view_count"].sum().reset_index()
-    daily_views.to_csv(processed_dir / "daily_views.csv", index=False)
+    daily_views = by_date["view_count"].sum().reset_index()
+    _write_processed(
+        daily_views, processed_dir, "daily_views",
+        quoting=csv.QUOTE_NONE, lineterminator="\n",
+    )
 
     # 争点別統計
     issue_data = []
@@ -685,13 +724,13 @@ def generate_all_sample_data():
             "total_comments": int(views * 0.005),
         })
     issue_stats = pd.DataFrame(issue_data).sort_values("total_views", ascending=False)
-    issue_stats.to_csv(
-        processed_dir / "issue_stats.csv", index=False, encoding="utf-8-sig"
+    _write_processed(
+        issue_stats, processed_dir, "issue_stats", encoding="utf-8-sig"
     )
 
     # チャンネル分析
-    df_channels.to_csv(
-        processed_dir / "channel_analysis.csv", index=False, encoding="utf-8-sig"
+    _write_processed(
+        df_channels, processed_dir, "channel_analysis", encoding="utf-8-sig"
     )
 
     # 政党動画統計
@@ -706,8 +745,9 @@ def generate_all_sample_data():
             "avg_views": views // n,
             "total_likes": int(views * 0.04),
         })
-    pd.DataFrame(party_video_data).to_csv(
-        processed_dir / "party_video_stats.csv", index=False, encoding="utf-8-sig"
+    _write_processed(
+        pd.DataFrame(party_video_data), processed_dir, "party_video_stats",
+        encoding="utf-8-sig",
     )
 
     # メディアチャンネルデータ
@@ -715,14 +755,14 @@ def generate_all_sample_data():
     df_media.to_csv(
         raw_dir / f"media_channels_{timestamp}.csv", index=False, encoding="utf-8-sig"
     )
-    df_media.to_csv(
-        processed_dir / "media_channels.csv", index=False, encoding="utf-8-sig"
+    _write_processed(
+        df_media, processed_dir, "media_channels", encoding="utf-8-sig"
     )
 
     # メディア政党言及分析
     df_media_topics = generate_media_video_topics()
-    df_media_topics.to_csv(
-        processed_dir / "media_party_mentions.csv", index=False, encoding="utf-8-sig"
+    _write_processed(
+        df_media_topics, processed_dir, "media_party_mentions", encoding="utf-8-sig"
     )
 
     # 感情分析
@@ -731,35 +771,38 @@ def generate_all_sample_data():
         {"sentiment": "neutral", "count": 210},
         {"sentiment": "negative", "count": 142},
     ])
-    sentiment_data.to_csv(processed_dir / "sentiment_counts.csv", index=False)
+    _write_processed(
+        sentiment_data, processed_dir, "sentiment_counts",
+        quoting=csv.QUOTE_NONE, lineterminator="\n",
+    )
 
     # ニュース記事データ
     df_news = generate_news_articles()
-    df_news.to_csv(
-        processed_dir / "news_articles.csv", index=False, encoding="utf-8-sig"
+    _write_processed(
+        df_news, processed_dir, "news_articles", encoding="utf-8-sig"
     )
 
     # 世論調査データ
     df_polling = generate_news_polling()
-    df_polling.to_csv(
-        processed_dir / "news_polling.csv", index=False, encoding="utf-8-sig"
+    _write_processed(
+        df_polling, processed_dir, "news_polling", encoding="utf-8-sig"
     )
 
     # 日別報道量
     df_daily_news = generate_news_daily_coverage()
-    df_daily_news.to_csv(
-        processed_dir / "news_daily_coverage.csv", index=False, encoding="utf-8-sig"
+    _write_processed(
+        df_daily_news, processed_dir, "news_daily_coverage", encoding="utf-8-sig"
     )
 
     # 選挙区・候補者データ
     df_districts = generate_district_candidates()
-    df_districts.to_csv(
-        processed_dir / "district_candidates.csv", index=False, encoding="utf-8-sig"
+    _write_processed(
+        df_districts, processed_dir, "district_candidates", encoding="utf-8-sig"
     )
 
     df_pref_summary = generate_prefecture_summary()
-    df_pref_summary.to_csv(
-        processed_dir / "prefecture_summary.csv", index=False, encoding="utf-8-sig"
+    _write_processed(
+        df_pref_summary, processed_dir, "prefecture_summary", encoding="utf-8-sig"
     )
 
     print(f"サンプルデータ生成完了!")
@@ -11,6 +11,8 @@ import pandas as pd
 
 from config import (
     DATA_DIR,
+    NATIONAL_AVG_BY_PARTY,
+    NATIONAL_AVG_DEFAULT,
     PREFECTURE_DISTRICTS,
     PREFECTURE_REGION_TYPE,
     REGIONAL_PARTY_STRENGTH,
@@ -84,9 +86,16 @@ def build_prefecture_lookup():
     return lookup
 
 
+# PREFECTURE_DISTRICTS は定数なので、参照テーブルはインポート時に一度だけ構築する
+_PREF_LOOKUP = build_prefecture_lookup()
+
+# 選挙区名 '北海道1区' → ('北海道', '1')
+_DISTRICT_RE = re.compile(r"^(.+?)(\d+)区$")
+
+
 def parse_district_name(district_name, pref_lookup):
     """'北海道1区' → (prefecture_code=1, district_number=1)"""
-    m = re.match(r"^(.+?)(\d+)区$", district_name)
+    m = _DISTRICT_RE.match(district_name)
     if not m:
         return None, None
     prefix, number = m.group(1), int(m.group(2))
@@ -102,85 +111,96 @@ def get_lookup_party(party_name):
     return "その他"
 
 
-def _estimate_vote_share(row, region_profile):
-    """候補者ごとの推定得票率を算出
+def _estimate_vote_share(lookup_party, regional, kubun):
+    """候補者ごとの推定得票率を列単位で算出（lookup_party・区分はカテゴリ列、regional は地域強度）
 
     アプローチ:
     1. 政党の小選挙区得票率ベースラインを出発点とする
     2. 地域の政党強度で加減算補正する（関西→維新+、北海道→立憲+など）
     3. 現職/前職ボーナスを加算する（知名度・地盤の効果）
     """
-    lookup_party = row["_lookup_party"]
-
     # 1. 小選挙区得票率ベースライン
-    base = SMD_VOTE_SHARE_BASELINE.get(lookup_party, 0.03)
+    base = lookup_party.map(SMD_VOTE_SHARE_BASELINE).astype(float).fillna(0.03).to_numpy()
 
     # 2. 地域補正: REGIONAL_PARTY_STRENGTHの全国平均からの偏差を加減算
-    regional = region_profile.get(lookup_party, 0.02)
-    # 全地域の平均を計算（4地域の単純平均）
-    all_regions = REGIONAL_PARTY_STRENGTH.values()
-    national_avg = sum(r.get(lookup_party, 0.02) for r in all_regions) / len(
-        REGIONAL_PARTY_STRENGTH
+    national_avg = (
+        lookup_party.map(NATIONAL_AVG_BY_PARTY).astype(float).fillna(NATIONAL_AVG_DEFAULT).to_numpy()
     )
     # 偏差を補正量として適用（±の範囲で穏やかに）
-    regional_delta = (regional - national_avg) * 0.5
+    regional_delta = (regional.to_numpy() - national_avg) * 0.5
     adjusted = base + regional_delta
 
     # 3. 区分ボーナス
-    kubun_bonus = KUBUN_VOTE_BONUS.get(row["区分"], 0.0)
+    kubun_bonus = kubun.map(KUBUN_VOTE_BONUS).astype(float).fillna(0.0).to_numpy()
     adjusted += kubun_bonus
 
-    return max(adjusted, 0.01)
+    return np.maximum(adjusted, 0.01)
 
 
 def predict_district_winners(csv_path):
     """選挙区ごとの当選予測を行う"""
     df = pd.read_csv(csv_path, dtype={"年齢": str})
 
-    pref_lookup = build_prefecture_lookup()
+    pref_lookup = _PREF_LOOKUP
 
     # 都道府県コード・選挙区番号を導出
     parsed = df["選挙区名"].apply(lambda x: parse_district_name(x, pref_lookup))
     df["_pref_code"] = parsed.apply(lambda x: x[0])
     df["_district_num"] = parsed.apply(lambda x: x[1])
-    df["_lookup_party"] = df["政党名"].apply(get_lookup_party)
-    df["_region_type"] = df["_pref_code"].map(PREFECTURE_REGION_TYPE).fillna("rural_ldp")
 
-    # 各候補者の推定得票率を計算
-    raw_scores = []
-    for _, row in df.iterrows():
-        region_profile = REGIONAL_PARTY_STRENGTH.get(row["_region_type"], {})
-        score = _estimate_vote_share(row, region_profile)
-        raw_scores.append(score)
+    # 種類の少ない文字列列はカテゴリ型にし、groupby・map を整数コードで処理する
+    # （カテゴリ型への apply は一意値ごとの評価になる）
+    for col in ["選挙区名", "政党名", "区分"]:
+        df[col] = df[col].astype("category")
+    df["_lookup_party"] = df["政党名"].apply(get_lookup_party).astype("category")
+    df["_region_type"] = (
+        df["_pref_code"].map(PREFECTURE_REGION_TYPE).fillna("rural_ldp").astype("category")
+    )
+
+    # 地域×政党の強度表を一度だけ縦持ちにして結合（行ごとの二重 dict 参照を避ける）
+    regional_df = (
+        pd.DataFrame(REGIONAL_PARTY_STRENGTH).T.stack().rename("_regional")
+        .rename_axis(["_region_type", "_lookup_party"]).reset_index()
+    )
+    df = df.merge(regional_df, on=["_region_type", "_lookup_party"], how="left")
+    df["_regional"] = df["_regional"].fillna(0.02)
 
+    # 各候補者の推定得票率を列ごとの参照・演算で一括計算
+    raw_scores = _estimate_vote_share(df["_lookup_party"], df["_regional"], df["区分"])
     df["_raw_score"] = raw_scores
 
     # 選挙区内で正規化→確率化、当選予測・確信度を算出
-    df["当選確率"] = 0.0
-    df["当選予測"] = 0
-    df["確信度"] = 0.0
+    # 結果は位置インデックスで NumPy 配列に書き込み、最後に一括で列へ代入する
+    raw_all = df["_raw_score"].to_numpy()
+    probs_out = np.zeros(len(df))
+    winner_out = np.zeros(len(df), dtype=np.int8)
+    conf_out = np.zeros(len(df))
 
-    for district, group in df.groupby("選挙区名"):
-        idx = group.index
-        raw = group["_raw_score"].values
+    for district, pos in df.groupby("選挙区名", observed=True).indices.items():
+        raw = raw_all[pos]
 
         # softmax（数値安定性のためmax引き）
         shifted = raw - raw.max()
         exp_scores = np.exp(shifted / SOFTMAX_TEMPERATURE)
         probs = exp_scores / exp_scores.sum()
 
-        df.loc[idx, "当選確率"] = probs
+        probs_out[pos] = probs
 
         # 当選者
-        winner_pos = np.argmax(probs)
-        winner_idx = idx[winner_pos]
-        df.loc[winner_idx, "当選予測"] = 1
-
-        # 確信度（1位と2位の差）
-        sorted_probs = np.sort(probs)[::-1]
-        margin = sorted_probs[0] - (sorted_probs[1] if len(sorted_probs) > 1 else 0)
+        winner_out[pos[np.argmax(probs)]] = 1
+
+        # 確信度（1位と2位の差）: 上位2件だけ必要なので全ソートせず partition で取得
+        if len(probs) > 1:
+            top2 = -np.partition(-probs, 1)[:2]
+            margin = top2[0] - top2[1]
+        else:
+            margin = probs[0]
         confidence = min(margin / CONFIDENCE_DENOMINATOR, 1.0)
-        df.loc[idx, "確信度"] = round(confidence, 4)
+        conf_out[pos] = round(confidence, 4)
+
+    df["当選確率"] = probs_out
+    df["当選予測"] = winner_out
+    df["確信度"] = conf_out
 
     return df
 
@@ -194,7 +214,9 @@ def save_results(df, output_path):
         "選挙区名", "候補者名", "政党名", "年齢", "区分", "当選人数",
         "当選予測", "当選確率", "確信度",
     ]
-    df[output_cols].to_csv(output_path, index=False, encoding="utf-8-sig")
+    df[output_cols].reset_index(drop=True).to_csv(
+        output_path, index=False, encoding="utf-8-sig"
+    )
     print(f"予測結果を保存: {output_path}")
 
 
@@ -210,7 +232,7 @@ def print_aggregate_stats(df):
     print(f"\n全{total_winners}選挙区の予測結果:")
 
     print("\n--- 政党別予測当選者数 ---")
-    party_seats = winners.groupby("政党名").size().sort_values(ascending=False)
+    party_seats = winners.groupby("政党名", observed=True).size().sort_values(ascending=False)
     for party, count in party_seats.items():
         pct = count / total_winners * 100
         print(f"  {party:20s}: {count:4d}議席 ({pct:5.1f}%)")
@@ -2,16 +2,29 @@
 議席予測スクリプト
 YouTubeデータ・ニュース記事・世論調査から7つのモデルで第51回衆院選の議席数を予測する
 """
+import functools
+import heapq
 import math
 import re
+import types
+import zlib
 
 import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    _PYARROW_AVAILABLE = True
+except ImportError:
+    _PYARROW_AVAILABLE = False
+
 from config import (
     DATA_DIR,
     KOMEITO_SMD_RATIO,
     KOMEITO_PR_RATIO,
+    NATIONAL_AVG_BY_PARTY,
+    NATIONAL_AVG_DEFAULT,
     OTHERS_SMD_RATIO,
     OTHERS_PR_RATIO,
     REGIONAL_PARTY_STRENGTH,
@@ -33,11 +46,29 @@ KNOWN_PARTIES = [
     "日本共産党", "れいわ新選組", "参政党", "チームみらい",
 ]
 
+# 動画タイトルの【...】タグと、その中の政党名を検出する正規表現
+_TITLE_RE = re.compile(r"【(.+?)】")
+_PARTY_RE = re.compile("|".join(re.escape(p) for p in KNOWN_PARTIES))
+# str.extract 用（捕捉グループ付き）
+_PARTY_GROUP_RE = re.compile(f"({_PARTY_RE.pattern})")
+
 # YouTubeデータにない政党の固定配分
 KOMEITO_SEATS = 24
 OTHERS_SEATS = 10
 FIXED_SEATS = KOMEITO_SEATS + OTHERS_SEATS  # 34
 
+# 固定配分の SMD/PR 内訳と、残りを YouTube 系政党に配分する議席数
+KOMEITO_SMD = round(KOMEITO_SEATS * KOMEITO_SMD_RATIO)
+KOMEITO_PR = round(KOMEITO_SEATS * KOMEITO_PR_RATIO)
+OTHERS_SMD = round(OTHERS_SEATS * OTHERS_SMD_RATIO)
+OTHERS_PR = round(OTHERS_SEATS * OTHERS_PR_RATIO)
+SMD_AVAILABLE = SMD_SEATS - KOMEITO_SMD - OTHERS_SMD
+PR_AVAILABLE = PR_SEATS - KOMEITO_PR - OTHERS_PR
+FIXED_RESULTS = {
+    "公明党": {"smd": KOMEITO_SMD, "pr": KOMEITO_PR, "total": KOMEITO_SEATS},
+    "その他": {"smd": OTHERS_SMD, "pr": OTHERS_PR, "total": OTHERS_SEATS},
+}
+
 # 選挙日（時間減衰計算用）
 ELECTION_DATE = pd.Timestamp("2026-02-08", tz="UTC")
 
@@ -163,38 +194,56 @@ SMD_2024_RESULTS_FILE = "smd_2024_results.csv"
 ALL_PARTIES = list(POLLING_BASELINE.keys())
 YOUTUBE_PARTIES = KNOWN_PARTIES
 
+# ALL_PARTIES の並びに揃えたベースライン・小選挙区比率のベクトル（読み取り専用）
+PARTY_INDEX = {p: i for i, p in enumerate(ALL_PARTIES)}
+POLLING_BASELINE_VEC = np.array([POLLING_BASELINE[p] for p in ALL_PARTIES], dtype=float)
+SMD_RATIO_VEC = np.array([HISTORICAL_SMD_RATIO.get(p, 0.5) for p in ALL_PARTIES])
+BASELINE_SMD_VEC = np.rint(POLLING_BASELINE_VEC * SMD_RATIO_VEC).astype(int)
+BASELINE_PR_VEC = POLLING_BASELINE_VEC.astype(int) - BASELINE_SMD_VEC
+for _vec in (POLLING_BASELINE_VEC, SMD_RATIO_VEC, BASELINE_SMD_VEC, BASELINE_PR_VEC):
+    _vec.setflags(write=False)
+
+# 地域タイプ×政党の強度を平坦化した参照表（地域補正用。政党別の全地域平均は config にある）
+REGIONAL_LOOKUP = {
+    (region_type, party): strength
+    for region_type, profile in REGIONAL_PARTY_STRENGTH.items()
+    for party, strength in profile.items()
+}
+
+# 世論調査データがない場合のベースライン支持率と、M5 でニュースに現れない政党の補完スコア
+POLLING_SHARES = types.MappingProxyType({p: v / TOTAL_SEATS for p, v in POLLING_BASELINE.items()})
+POLLING_FALLBACK = types.MappingProxyType({p: v * 0.5 for p, v in POLLING_SHARES.items()})
+
 
 # === キューブ法則指数の較正 ===
 
+@functools.lru_cache(maxsize=None)
 def calibrate_cube_exponent():
-    """過去選挙の得票率→議席率データからキューブ法則指数を較正"""
-    best_exp = CUBE_EXPONENT_DEFAULT
-    best_error = float("inf")
-
-    for exp in [x / 10.0 for x in range(15, 41)]:
-        total_error = 0.0
-        count = 0
-        for year, parties in HISTORICAL_ELECTIONS.items():
-            vote_shares = {p: d["vote_share"] for p, d in parties.items() if d["vote_share"] > 0}
-            actual_seats = {p: d["seat_share"] for p, d in parties.items()}
+    """過去選挙の得票率→議席率データからキューブ法則指数を較正
 
-            adjusted = {p: s ** exp for p, s in vote_shares.items()}
-            total_adj = sum(adjusted.values())
-            if total_adj == 0:
-                continue
-            predicted = {p: v / total_adj for p, v in adjusted.items()}
+    (指数, 選挙, 政党) の3次元配列で全候補（1.5〜4.0）を一括評価する
+    """
+    exps = np.arange(15, 41) / 10.0
 
-            for p in vote_shares:
-                total_error += (predicted[p] - actual_seats.get(p, 0)) ** 2
-                count += 1
+    # 選挙ごとの得票率・議席率を政党軸ゼロ埋めで (選挙, 政党) 配列に揃える
+    n_parties = max(len(parties) for parties in HISTORICAL_ELECTIONS.values())
+    V = np.zeros((len(HISTORICAL_ELECTIONS), n_parties))
+    S = np.zeros_like(V)
+    for i, parties in enumerate(HISTORICAL_ELECTIONS.values()):
+        V[i, :len(parties)] = [d["vote_share"] for d in parties.values()]
+        S[i, :len(parties)] = [d["seat_share"] for d in parties.values()]
+    M = V > 0
+    if not M.any():
+        return CUBE_EXPONENT_DEFAULT
 
-        if count > 0:
-            mse = total_error / count
-            if mse < best_error:
-                best_error = mse
-                best_exp = exp
+    A = np.where(M, V, 0.0)[None] ** exps[:, None, None]
+    total = A.sum(axis=-1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        P = A / total
+    err = np.where(M, (P - S) ** 2, 0.0).sum(axis=(1, 2)) / M.sum()
 
-    return best_exp
+    # 誤差最小の指数（同率なら小さい方）
+    return float(exps[err.argmin()])
 
 
 CUBE_EXPONENT = calibrate_cube_exponent()
@@ -202,43 +251,218 @@ CUBE_EXPONENT = calibrate_cube_exponent()
 
 # === データ読み込み ===
 
+# 選挙区名（"北海道1区" など）の解析用: 都道府県の短縮名→コード、コード→都道府県名
+_DISTRICT_RE = re.compile(r"^(.+?)(\d+)区$")
+_PREF_SHORT_TO_CODE = {
+    (name[:-1] if name.endswith(("都", "府", "県")) else name): code
+    for code, (name, _) in PREFECTURE_DISTRICTS.items()
+}
+_PREF_NAMES = {code: name for code, (name, _) in PREFECTURE_DISTRICTS.items()}
+
+
+# 予測で使う列とその型（件数・再生数は欠損があり得るので float64 で読む）
+_PARTY_LABEL = {"party_name": "category"}
+_CSV_COLUMNS = {
+    "channels": {**_PARTY_LABEL, "subscriber_count": "float64", "view_count": "float64"},
+    "party_stats": {
+        **_PARTY_LABEL, "total_views": "float64", "total_likes": "float64", "avg_views": "float64",
+    },
+    "videos": {
+        "video_id": "str", "title": "str", "published_at": "str",
+        "view_count": "float64", "like_count": "float64",
+    },
+    "comments": {"video_id": "str", "sentiment": "category", "sentiment_score": "float64"},
+    "news_articles": {
+        "published_at": "str", "credibility_score": "float64", "mentioned_parties": "str",
+        "tone": "float64", "page_views": "float64",
+    },
+    "news_polling": {
+        **_PARTY_LABEL, "survey_date": "str", "support_rate": "float64", "sample_size": "float64",
+    },
+    "media_mentions": {**_PARTY_LABEL, "media_mention_views": "float64"},
+}
+
+
+def _csv_kwargs(columns):
+    """read_csv に渡す usecols / dtype（ファイルに無い列があっても読めるよう usecols は関数で渡す）"""
+    if columns is None:
+        return {}
+    return {"usecols": lambda c: c in columns, "dtype": columns}
+
+
+def _select_columns(df, columns):
+    """全列の DataFrame から使う列だけを選び、型を揃える
+
+    "str" 列の欠損は read_csv(dtype=str) と同じく NaN のまま残す（文字列 "nan" / "None" にしない）
+    """
+    if columns is None:
+        return df
+    df = df[[c for c in df.columns if c in columns]]
+    str_cols = {c: df[c] for c in df.columns if columns[c] == "str"}
+    df = df.astype({c: columns[c] for c in df.columns if c not in str_cols})
+    return df.assign(**{c: s.astype(str).where(s.notna(), np.nan) for c, s in str_cols.items()})
+
+
+def _columns_key(columns):
+    """キャッシュのファイル名に入れる列の組の識別子（列名と型から決まる8桁の16進数）"""
+    if columns is None:
+        return "all"
+    return f"{zlib.crc32(repr(sorted(columns.items())).encode()):08x}"
+
+
+def _processed_source(csv_path):
+    """processed の入力として読むファイル
+
+    CSV があれば CSV。CSV が無く、サンプル生成（SAMPLE_EXPORT_FORMAT=parquet）が書いた
+    同名の .parquet だけがあればそれを読む。どちらも無ければ None
+    """
+    if csv_path.exists():
+        return csv_path
+    exported = csv_path.with_suffix(".parquet")
+    return exported if exported.exists() else None
+
+
+def _read_processed_csv(csv_path, columns=None):
+    """processed のCSVを読み込む（columns: 使う列名 → 型）
+
+    CSV が無く同名の .parquet だけがあればそれを読む（CSV があれば .parquet は見ない）。
+    pyarrow があれば CSV のキャッシュを別名の .cache.parquet に持ち、CSV の方が新しければ作り直す。
+    キャッシュは columns で読んだ結果を持ち、列の組ごとに別ファイルにする。
+    書けない値（型の混ざった object 列など）で保存に失敗したらキャッシュせずに返す
+    """
+    source = _processed_source(csv_path)
+    if source is not None and source != csv_path:
+        return _select_columns(pd.read_parquet(source), columns)
+
+    if not _PYARROW_AVAILABLE:
+        return pd.read_csv(csv_path, **_csv_kwargs(columns))
+
+    cache_path = csv_path.with_suffix(f".{_columns_key(columns)}.cache.parquet")
+    if cache_path.exists() and cache_path.stat().st_mtime >= csv_path.stat().st_mtime:
+        return _select_columns(pd.read_parquet(cache_path), columns)
+
+    df = pd.read_csv(csv_path, **_csv_kwargs(columns))
+    try:
+        df.to_parquet(cache_path, index=False, compression="zstd")
+    except (OSError, ValueError):
+        cache_path.unlink(missing_ok=True)
+    return df
+
+
+def _consolidated(df):
+    """列を追加した DataFrame のブロックを dtype ごとに1つの連続配列へまとめ直す
+
+    pandas は同じ dtype の列を (列数, 行数) の C 順配列で保持するため各列は既に連続している。
+    後から追加した列は別ブロックになるので、集計前に copy でまとめておく
+    """
+    return df.copy() if not df.empty else df
+
+
+# 予測の入力ファイル（processed 配下）。raw 配下は glob で都度列挙する
+_PREDICTION_INPUTS = (
+    "channel_analysis.csv", "party_video_stats.csv", "comments_with_sentiment.csv",
+    "news_articles.csv", "news_polling.csv", "media_party_mentions.csv",
+    "district_candidates.csv", SMD_2024_RESULTS_FILE,
+)
+
+# load_prediction_data の直近の入力ファイル署名（パスと更新時刻）と結果
+_DATA_CACHE = {"signature": None, "data": None}
+
+
+def _prediction_input_signature():
+    """入力ファイルのパスと更新時刻の組。いずれかが変われば読み込み直す"""
+    paths = [PROCESSED_DIR / name for name in _PREDICTION_INPUTS]
+    # CSV の代わりに読むことがあるサンプル生成の .parquet も含める
+    paths += [p.with_suffix(".parquet") for p in paths if p.suffix == ".csv"]
+    paths += sorted(RAW_DIR.glob("video_details_*.csv")) + sorted(RAW_DIR.glob("comments_*.csv"))
+    return tuple((str(p), p.stat().st_mtime_ns) for p in paths if p.exists())
+
+
 def load_prediction_data():
+    """予測に必要な全データを読み込む（入力ファイルが変わっていなければ前回の結果を返す）"""
+    signature = _prediction_input_signature()
+    if _DATA_CACHE["signature"] != signature:
+        _DATA_CACHE.update(signature=signature, data=_load_prediction_data())
+    return dict(_DATA_CACHE["data"])
+
+
+def _load_prediction_data():
     """予測に必要な全データを読み込む"""
     data = {}
-    data["channels"] = pd.read_csv(PROCESSED_DIR / "channel_analysis.csv")
-    data["party_stats"] = pd.read_csv(PROCESSED_DIR / "party_video_stats.csv")
+    # 使う列だけを型指定で読み込む（政党名はカテゴリ型で、比較・groupby を整数コードで行う）
+    data["channels"] = _read_processed_csv(
+        PROCESSED_DIR / "channel_analysis.csv", _CSV_COLUMNS["channels"]
+    )
+    data["party_stats"] = _read_processed_csv(
+        PROCESSED_DIR / "party_video_stats.csv", _CSV_COLUMNS["party_stats"]
+    )
 
     raw_videos = sorted(RAW_DIR.glob("video_details_*.csv"), reverse=True)
     if raw_videos:
-        data["videos"] = pd.read_csv(raw_videos[0])
+        data["videos"] = pd.read_csv(raw_videos[0], **_csv_kwargs(_CSV_COLUMNS["videos"]))
+        # 日時の変換・タイトルからの政党抽出は各モデルで共通なので読み込み時に一度だけ行う
+        if "published_at" in data["videos"].columns:
+            data["videos"]["published_at"] = pd.to_datetime(
+                data["videos"]["published_at"], errors="coerce"
+            )
+        if "title" in data["videos"].columns:
+            data["videos"]["title_party"] = (
+                extract_party_from_titles(data["videos"]["title"]).astype("category")
+            )
+            data["videos"] = _consolidated(data["videos"])
     else:
         data["videos"] = pd.DataFrame()
 
     comments_path = PROCESSED_DIR / "comments_with_sentiment.csv"
     if comments_path.exists():
-        data["comments"] = pd.read_csv(comments_path)
+        data["comments"] = pd.read_csv(comments_path, **_csv_kwargs(_CSV_COLUMNS["comments"]))
     else:
         raw_comments = sorted(RAW_DIR.glob("comments_*.csv"), reverse=True)
         if raw_comments:
-            data["comments"] = pd.read_csv(raw_comments[0])
+            data["comments"] = pd.read_csv(
+                raw_comments[0], **_csv_kwargs(_CSV_COLUMNS["comments"])
+            )
             data["comments"]["sentiment"] = "neutral"
+            data["comments"] = _consolidated(data["comments"])
         else:
             data["comments"] = pd.DataFrame()
 
     news_path = PROCESSED_DIR / "news_articles.csv"
-    data["news_articles"] = pd.read_csv(news_path) if news_path.exists() else pd.DataFrame()
+    data["news_articles"] = (
+        _read_processed_csv(news_path, _CSV_COLUMNS["news_articles"])
+        if _processed_source(news_path) else pd.DataFrame()
+    )
+    if "published_at" in data["news_articles"].columns:
+        data["news_articles"]["published_at"] = pd.to_datetime(
+            data["news_articles"]["published_at"], errors="coerce"
+        )
 
     polling_path = PROCESSED_DIR / "news_polling.csv"
-    data["news_polling"] = pd.read_csv(polling_path) if polling_path.exists() else pd.DataFrame()
+    data["news_polling"] = (
+        _read_processed_csv(polling_path, _CSV_COLUMNS["news_polling"])
+        if _processed_source(polling_path) else pd.DataFrame()
+    )
+    if "survey_date" in data["news_polling"].columns:
+        data["news_polling"]["survey_date"] = pd.to_datetime(data["news_polling"]["survey_date"])
 
     # メディア言及データ
     media_path = PROCESSED_DIR / "media_party_mentions.csv"
-    data["media_mentions"] = pd.read_csv(media_path) if media_path.exists() else pd.DataFrame()
+    data["media_mentions"] = (
+        _read_processed_csv(media_path, _CSV_COLUMNS["media_mentions"])
+        if _processed_source(media_path) else pd.DataFrame()
+    )
 
     # 候補者データ（議席上限制約用 + Model 7用）
     candidates_path = PROCESSED_DIR / "district_candidates.csv"
-    if candidates_path.exists():
-        raw_cand = pd.read_csv(candidates_path)
+    candidates_source = _processed_source(candidates_path)
+    if candidates_source is not None:
+        # 政党名・区分は比較とマッピングにしか使わないのでカテゴリ型で読み込む
+        cand_dtype = {"政党名": "category", "区分": "category"}
+        if candidates_source == candidates_path:
+            raw_cand = pd.read_csv(candidates_path, dtype=cand_dtype)
+        else:
+            raw_cand = pd.read_parquet(candidates_source)
+            raw_cand = raw_cand.astype({c: t for c, t in cand_dtype.items() if c in raw_cand.columns})
         data["candidates"] = _prepare_candidates(raw_cand, data)
     else:
         data["candidates"] = pd.DataFrame()
@@ -271,43 +495,30 @@ def _prepare_candidates(raw_cand, data):
     cand["is_incumbent"] = (cand["区分"].isin(["現職", "前職"])).astype(int)
 
     # 選挙区名→prefecture_code, district_number
-    _PREF_SHORT_TO_CODE = {}
-    for code, (full_name, _) in PREFECTURE_DISTRICTS.items():
-        short = full_name
-        for suffix in ["都", "府", "県"]:
-            if short.endswith(suffix):
-                short = short[:-1]
-                break
-        _PREF_SHORT_TO_CODE[short] = code
-    _PREF_NAMES = {code: name for code, (name, _) in PREFECTURE_DISTRICTS.items()}
-
-    def _parse_district(d):
-        m = re.match(r"^(.+?)(\d+)区$", d)
-        if not m:
-            return None, None
-        return _PREF_SHORT_TO_CODE.get(m.group(1)), int(m.group(2))
-
-    parsed = cand["選挙区名"].apply(_parse_district)
-    cand["prefecture_code"] = parsed.apply(lambda x: x[0])
-    cand["district_number"] = parsed.apply(lambda x: x[1])
+    parsed = cand["選挙区名"].str.extract(_DISTRICT_RE)
+    cand["prefecture_code"] = parsed[0].map(_PREF_SHORT_TO_CODE)
+    cand["district_number"] = pd.to_numeric(parsed[1], errors="coerce").astype("Int64")
     cand["prefecture_name"] = cand["prefecture_code"].map(_PREF_NAMES)
     cand["district_name"] = cand["選挙区名"]
 
+    # 政党は (政党名一覧, 整数コード) の形で一度だけ符号化し、6信号はすべてコード配列から引く
+    party_codes = _label_codes(cand["party"])
+
     # --- ① partisan_lean: 前回(2024)選挙区結果ベースの党派性スコア ---
     # 538の最重要変数。前回選挙でどの政党がその選挙区を制したかを基に
     # 候補者の政党がその選挙区でどの程度有利かを定量化する
-    cand["partisan_lean"] = _compute_partisan_lean(cand, data)
+    cand["partisan_lean"] = _compute_partisan_lean(cand, data, party_codes)
 
     # --- ② polling_swing: 世論調査の支持率変動 ---
     # 前回2024年選挙時の得票率 vs 現在の世論調査支持率の変動幅
-    cand["polling_swing"] = _compute_polling_swing(cand, data)
+    cand["polling_swing"] = _compute_polling_swing(cand, data, party_codes)
 
     # --- ③ candidate_strength: 候補者の個人的強さ ---
     # 538のcandidate experience + fundraisingに相当
     KUBUN_STRENGTH = {
         "現職": 0.30, "前職": 0.22, "元職": 0.12, "新人": 0.05, "不明": 0.03,
     }
-    cand["candidate_strength"] = cand["区分"].map(KUBUN_STRENGTH).fillna(0.03)
+    cand["candidate_strength"] = _lookup_by_label(_label_codes(cand["区分"]), KUBUN_STRENGTH, 0.03)
 
     # --- ④ incumbency: 現職ボーナス（日本のRD研究で弱いことが判明） ---
     cand["incumbency"] = cand["is_incumbent"].astype(float) * INCUMBENT_BONUS_VALUE
@@ -320,11 +531,10 @@ def _prepare_candidates(raw_cand, data):
         if not channels.empty and not party_stats.empty:
             eng_scores = compute_engagement_scores(data)
             max_eng = max(eng_scores.values()) if eng_scores else 1
-            for party, score in eng_scores.items():
-                cand.loc[cand["party"] == party, "youtube_score"] = score / max_eng
+            yt_norm = {party: score / max_eng for party, score in eng_scores.items()}
             # 中道改革連合 = 立憲のYouTubeスコアを継承（公明はYouTubeデータなし）
-            ritsumin_yt = eng_scores.get("立憲民主党", 0) / max_eng if max_eng else 0
-            cand.loc[cand["party"] == "中道改革連合", "youtube_score"] = ritsumin_yt
+            yt_norm["中道改革連合"] = eng_scores.get("立憲民主党", 0) / max_eng if max_eng else 0
+            cand["youtube_score"] = _lookup_by_label(party_codes, yt_norm, 0.0)
     except Exception:
         pass
 
@@ -333,29 +543,87 @@ def _prepare_candidates(raw_cand, data):
     try:
         articles = data.get("news_articles", pd.DataFrame())
         if not articles.empty and "mentioned_parties" in articles.columns:
-            party_mention_count = {}
-            for parties_str in articles["mentioned_parties"].dropna():
-                for p in str(parties_str).split("|"):
-                    if p and p != "nan":
-                        party_mention_count[p] = party_mention_count.get(p, 0) + 1
-            for party, count in party_mention_count.items():
-                cand.loc[cand["party"] == party, "news_mentions"] = count
+            party_mention_count = _party_mention_counts(articles["mentioned_parties"])
             # 中道改革連合 = 立憲 + 公明 のニュース言及を合算
-            chudo_mentions = (
+            party_mention_count["中道改革連合"] = (
                 party_mention_count.get("立憲民主党", 0)
                 + party_mention_count.get("公明党", 0)
             )
-            cand.loc[cand["party"] == "中道改革連合", "news_mentions"] = chudo_mentions
+            cand["news_mentions"] = _lookup_by_label(party_codes, party_mention_count, 0.0)
     except Exception:
         pass  # ニュースデータがない場合は0のまま
 
     # predicted_vote_share を後方互換性のため残す（出力用）
     cand["predicted_vote_share"] = cand["partisan_lean"] + cand["polling_swing"]
 
+    # 整数列は値域に合わせて縮小（欠損を含む列は float のまま残る。信号列は精度を保つため float64）
+    for col in ["age", "district_number", "is_incumbent", "prefecture_code"]:
+        if pd.api.types.is_integer_dtype(cand[col]):
+            cand[col] = pd.to_numeric(cand[col], downcast="integer")
+
     return cand
 
 
-def _compute_partisan_lean(cand, data):
+def _label_codes(labels):
+    """ラベル列を (ラベル一覧, 整数コード配列) に符号化する（欠損はコード -1）"""
+    labels = labels.astype("category")
+    return labels.cat.categories, labels.cat.codes.to_numpy()
+
+
+def _lookup_by_label(label_codes, table, default):
+    """ラベル別の値 table をコード配列に展開する（table にないラベル・欠損は default）"""
+    names, codes = label_codes
+    values = np.array([table.get(name, default) for name in names] + [default])
+    return values[codes]
+
+
+def _explode_mentions(mentioned_parties):
+    """'|' 区切りの言及政党列を1行1政党に展開する（インデックスは元の記事、前後の空白は除く）
+
+    pyarrow があれば分割・平坦化・空白除去を Arrow の compute カーネルで行い、
+    list_parent_indices で元の記事インデックスに戻す
+    """
+    mentioned_parties = mentioned_parties.dropna().astype(str)
+    if not _PYARROW_AVAILABLE:
+        return mentioned_parties.str.split("|").explode().str.strip()
+    split = pc.split_pattern(pa.array(mentioned_parties.to_numpy(), type=pa.string()), "|")
+    parents = pc.list_parent_indices(split).to_numpy()
+    flat = pc.utf8_trim_whitespace(pc.list_flatten(split))
+    return pd.Series(
+        flat.to_numpy(zero_copy_only=False), index=mentioned_parties.index[parents],
+        dtype=object,
+    )
+
+
+def _party_mention_counts(mentioned_parties):
+    """'|' 区切りの言及政党列から政党別の言及回数を数える"""
+    mentioned = _explode_mentions(mentioned_parties)
+    return mentioned[mentioned.ne("") & mentioned.ne("nan")].value_counts().to_dict()
+
+
+@functools.lru_cache(maxsize=1)
+def _load_results_2024(results_path, mtime_ns):
+    """2024年選挙区結果を選挙区名で索引付け・整列した勝者/得票差の表にする
+
+    ファイルの更新時刻をキーにキャッシュする（返す DataFrame は共有なので書き換えない）。
+    district_name が重複する場合は後の行を採用
+    """
+    results_2024 = pd.read_csv(results_path)
+    results_2024 = (
+        results_2024.dropna(subset=["district_name"])
+        .drop_duplicates("district_name", keep="last")
+        .set_index("district_name")
+        .sort_index()
+    )
+    return pd.DataFrame({
+        "winner": results_2024["winner_party_jp"]
+        if "winner_party_jp" in results_2024.columns else "",
+        "margin": pd.to_numeric(results_2024["margin"]) / 100.0
+        if "margin" in results_2024.columns else np.nan,
+    }, index=results_2024.index)
+
+
+def _compute_partisan_lean(cand, data, party_codes):
     """前回(2024)選挙区結果に基づく党派性スコアを算出。
     538のPartisan Lean / Cook PVI に相当する最重要変数。
     その選挙区を前回どの政党が制したかで、候補者の政党に有利/不利スコアを付与。
@@ -368,81 +636,76 @@ def _compute_partisan_lean(cand, data):
     # 2024年選挙区結果を読み込み
     results_path = PROCESSED_DIR / SMD_2024_RESULTS_FILE
     if not results_path.exists():
-        return _fallback_vote_share_baseline(cand)
+        return _fallback_vote_share_baseline(party_codes)
 
-    results_2024 = pd.read_csv(results_path)
+    prev_2024 = _load_results_2024(str(results_path), results_path.stat().st_mtime_ns)
 
     # 中道改革連合の構成政党（2024年時点の個別政党名）
     CHUDO_MEMBERS_2024 = {"立憲民主党", "公明党"}
 
-    # 選挙区キーを作成（district_name で結合）
-    district_winner = {}
-    district_margin = {}
-    for _, row in results_2024.iterrows():
-        dn = row.get("district_name")
-        if pd.notna(dn):
-            district_winner[dn] = row.get("winner_party_jp", "")
-            margin = row.get("margin")
-            district_margin[dn] = float(margin) / 100.0 if pd.notna(margin) else 0.05
+    district_winner = prev_2024["winner"]
 
     # 全国の2024年SMD勝者分布から政党別の勝率を算出
-    total_districts = len(district_winner)
-    party_win_rate_2024 = {}
-    for party in ALL_PARTIES + ["中道改革連合"]:
-        if party == "中道改革連合":
-            # 中道改革連合 = 立憲 + 公明 の合計勝率
-            wins = sum(1 for w in district_winner.values() if w in CHUDO_MEMBERS_2024)
-        else:
-            wins = sum(1 for w in district_winner.values() if w == party)
-        party_win_rate_2024[party] = wins / max(total_districts, 1)
-
-    def _is_party_match(candidate_party, winner_2024):
-        """候補者の政党と前回勝者が同一陣営かどうか判定"""
-        if candidate_party == "中道改革連合":
-            # 中道改革連合候補: 立憲 OR 公明が前回勝っていれば自陣営の勝利
-            return winner_2024 in CHUDO_MEMBERS_2024
-        return candidate_party == winner_2024
-
-    # 各候補者の partisan_lean を計算
-    lean_scores = []
-    for _, row in cand.iterrows():
-        party = row["party"]
-        district = row.get("district_name", row.get("選挙区名", ""))
-
-        winner_2024 = district_winner.get(district, "")
-        margin_2024 = district_margin.get(district, 0.05)
-
-        if _is_party_match(party, winner_2024):
-            # この候補者の政党（陣営）が前回勝った選挙区 → 有利
-            lean = 0.40 + min(margin_2024, 0.20) * 1.5
-            # 中道改革連合は2026年の新連合なので、前回の個別政党勝利からの
-            # 引き継ぎに不確実性がある（組織統合コスト）→ 10%割引
-            if party == "中道改革連合":
-                lean *= 0.90
-        elif winner_2024 == "":
-            lean = party_win_rate_2024.get(party, 0.02) * 0.5 + 0.10
-        else:
-            # 前回は別の政党が勝った → 不利だが、接戦なら可能性あり
-            lean = max(0.05, 0.25 - margin_2024 * 1.0)
+    total_districts = max(len(district_winner), 1)
+    wins = district_winner.value_counts()
+    party_win_rate_2024 = {
+        party: wins.get(party, 0) / total_districts for party in ALL_PARTIES
+    }
+    # 中道改革連合 = 立憲 + 公明 の合計勝率
+    party_win_rate_2024["中道改革連合"] = (
+        district_winner.isin(CHUDO_MEMBERS_2024).sum() / total_districts
+    )
 
-        # 地域補正を軽く加味
-        rt = PREFECTURE_REGION_TYPE.get(row.get("prefecture_code"), "rural_ldp")
-        region_profile = REGIONAL_PARTY_STRENGTH.get(rt, {})
-        # 中道改革連合は立憲の地域強度を参照
-        lookup_party = "立憲民主党" if party == "中道改革連合" else party
-        regional = region_profile.get(lookup_party, 0.02)
-        national_avg = sum(
-            r.get(lookup_party, 0.02) for r in REGIONAL_PARTY_STRENGTH.values()
-        ) / max(len(REGIONAL_PARTY_STRENGTH), 1)
-        regional_delta = (regional - national_avg) * 0.15
-        lean += regional_delta
+    # 候補者ごとに前回勝者・得票差を1回の結合で引く（前回結果にない選挙区は勝者 ""・得票差 0.05）
+    district = cand["district_name"] if "district_name" in cand.columns else cand["選挙区名"]
+    prev = prev_2024.reindex(district.to_numpy()).set_index(cand.index)
+    in_results = district.isin(prev_2024.index)
+    winner_2024 = prev["winner"].where(in_results, "")
+    margin_2024 = prev["margin"].fillna(0.05).to_numpy()
+    is_chudo = _lookup_by_label(party_codes, {"中道改革連合": True}, False)
+
+    # 候補者の政党（陣営）が前回勝った選挙区か（前回勝者を候補者と同じ政党コードに符号化して比較）
+    # 中道改革連合候補: 立憲 OR 公明が前回勝っていれば自陣営の勝利
+    party_names, party_code = party_codes
+    winner_code = pd.Categorical(winner_2024, categories=party_names).codes
+    is_match = np.where(
+        is_chudo, winner_2024.isin(CHUDO_MEMBERS_2024),
+        (party_code == winner_code) & (party_code >= 0),
+    )
+
+    # 自陣営が前回勝った選挙区 → 有利
+    # 中道改革連合は2026年の新連合なので、前回の個別政党勝利からの
+    # 引き継ぎに不確実性がある（組織統合コスト）→ 10%割引
+    lean_match = 0.40 + np.minimum(margin_2024, 0.20) * 1.5
+    lean_match = np.where(is_chudo, lean_match * 0.90, lean_match)
+    # 前回結果のない選挙区 → 全国勝率ベース
+    lean_unknown = _lookup_by_label(party_codes, party_win_rate_2024, 0.02) * 0.5 + 0.10
+    # 前回は別の政党が勝った → 不利だが、接戦なら可能性あり
+    lean_other = np.maximum(0.05, 0.25 - margin_2024 * 1.0)
+
+    lean = np.select(
+        [is_match, (winner_2024 == "").to_numpy()], [lean_match, lean_unknown], lean_other
+    )
 
-        lean_scores.append(max(lean, 0.01))
+    # 地域補正を軽く加味（中道改革連合は立憲の地域強度を参照）
+    region_type = cand["prefecture_code"].map(PREFECTURE_REGION_TYPE).fillna("rural_ldp")
+    lookup_party = cand["party"].astype(object).where(~is_chudo, "立憲民主党")
+    regional = (
+        pd.MultiIndex.from_arrays([region_type, lookup_party]).map(REGIONAL_LOOKUP)
+        .fillna(0.02).to_numpy()
+    )
+    national_avg_table = {
+        **NATIONAL_AVG_BY_PARTY,
+        "中道改革連合": NATIONAL_AVG_BY_PARTY.get("立憲民主党", NATIONAL_AVG_DEFAULT),
+    }
+    national_avg = _lookup_by_label(party_codes, national_avg_table, NATIONAL_AVG_DEFAULT)
+    regional_delta = (regional - national_avg) * 0.15
+    lean = lean + regional_delta
 
-    return pd.Series(lean_scores, index=cand.index)
+    return np.maximum(lean, 0.01)
 
 
-def _compute_polling_swing(cand, data):
+def _compute_polling_swing(cand, data, party_codes):
     """世論調査の支持率変動スコア。
     前回2024年選挙時の全国得票率 vs 現在のPOLLING_BASELINEの変動幅を候補者に反映。
 
@@ -482,11 +745,10 @@ def _compute_polling_swing(cand, data):
         curr = current_shares.get(party, 0.01)
         party_swing[party] = (curr - prev) * 0.5
 
-    swing_scores = cand["party"].map(party_swing).fillna(0.0)
-    return swing_scores
+    return _lookup_by_label(party_codes, party_swing, 0.0)
 
 
-def _fallback_vote_share_baseline(cand):
+def _fallback_vote_share_baseline(party_codes):
     """2024年選挙区結果がない場合のフォールバック（旧方式）"""
     SMD_VOTE_SHARE_BASELINE = {
         "自由民主党":   0.38, "立憲民主党":   0.30, "日本維新の会": 0.25,
@@ -494,18 +756,28 @@ def _fallback_vote_share_baseline(cand):
         "参政党":       0.04, "公明党":       0.15, "チームみらい": 0.05,
         "無所属":       0.12, "その他":       0.03,
     }
-    return cand["party"].map(SMD_VOTE_SHARE_BASELINE).fillna(0.03)
+    return _lookup_by_label(party_codes, SMD_VOTE_SHARE_BASELINE, 0.03)
 
 
+@functools.lru_cache(maxsize=4096)
 def extract_party_from_title(title):
-    """動画タイトルから政党名を抽出"""
-    match = re.search(r"【(.+?)】", str(title))
-    if match:
-        text = match.group(1)
-        for party in KNOWN_PARTIES:
-            if party in text:
-                return party
-    return None
+    """動画タイトルから政党名を抽出（1件用。列には extract_party_from_titles を使う）"""
+    match = _TITLE_RE.search(str(title))
+    party_match = _PARTY_RE.search(match.group(1)) if match else None
+    return party_match.group(0) if party_match else None
+
+
+def extract_party_from_titles(titles):
+    """動画タイトル列から政党名を一括抽出（該当なしは NaN）"""
+    tags = titles.fillna("").astype(str).str.extract(_TITLE_RE, expand=False)
+    return tags.str.extract(_PARTY_GROUP_RE, expand=False)
+
+
+def _video_parties(videos):
+    """動画ごとの政党名（load_prediction_data で抽出済みならそれを使う）"""
+    if "title_party" in videos.columns:
+        return videos["title_party"]
+    return extract_party_from_titles(videos["title"])
 
 
 def derive_party_sentiment(data):
@@ -517,7 +789,7 @@ def derive_party_sentiment(data):
         return {p: 0.0 for p in KNOWN_PARTIES}
 
     videos = videos.copy()
-    videos["party"] = videos["title"].apply(extract_party_from_title)
+    videos["party"] = _video_parties(videos)
 
     merged = comments.merge(
         videos[["video_id", "party"]], on="video_id", how="left"
@@ -526,35 +798,39 @@ def derive_party_sentiment(data):
 
     # sentiment_scoreがある場合（連続値）はそれを使う
     if "sentiment_score" in merged.columns:
-        sentiment_scores = {}
-        for party in KNOWN_PARTIES:
-            party_comments = merged[merged["party"] == party]
-            if len(party_comments) < 3:
-                sentiment_scores[party] = 0.0
-            else:
-                sentiment_scores[party] = party_comments["sentiment_score"].mean()
-        return sentiment_scores
+        agg = merged.groupby("party", observed=True)["sentiment_score"].agg(["mean", "size"])
+        return {
+            p: agg.at[p, "mean"] if p in agg.index and agg.at[p, "size"] >= 3 else 0.0
+            for p in KNOWN_PARTIES
+        }
 
     if "sentiment" not in merged.columns:
         return {p: 0.0 for p in KNOWN_PARTIES}
 
-    # フォールバック: 3値分類からスコア算出
-    sentiment_scores = {}
-    for party in KNOWN_PARTIES:
-        party_comments = merged[merged["party"] == party]
-        if len(party_comments) < 3:
-            sentiment_scores[party] = 0.0
-            continue
-        total = len(party_comments)
-        pos = (party_comments["sentiment"] == "positive").sum()
-        neg = (party_comments["sentiment"] == "negative").sum()
-        sentiment_scores[party] = (pos - neg) / total
-
-    return sentiment_scores
+    # フォールバック: 3値分類からスコア算出（(肯定数 - 否定数) / 件数）
+    agg = pd.DataFrame({
+        "pos": (merged["sentiment"] == "positive").astype(int),
+        "neg": (merged["sentiment"] == "negative").astype(int),
+    }).groupby(merged["party"], observed=True).agg(
+        pos=("pos", "sum"), neg=("neg", "sum"), total=("pos", "size")
+    )
+    scores = (agg["pos"] - agg["neg"]) / agg["total"]
+    return {
+        p: scores[p] if p in agg.index and agg.at[p, "total"] >= 3 else 0.0
+        for p in KNOWN_PARTIES
+    }
 
 
 # === 候補者数上限制約 ===
 
+def _independents_as_others(party):
+    """政党列の「無所属」を「その他」にまとめ、カテゴリ型で返す
+
+    カテゴリ型の replace は非推奨のため、カテゴリ単位の map で置換してから型を戻す
+    """
+    return party.map(lambda p: "その他" if p == "無所属" else p).astype("category")
+
+
 def compute_candidate_caps(data):
     """政党別の候補者数から小選挙区・比例代表の議席上限を算出
 
@@ -569,7 +845,7 @@ def compute_candidate_caps(data):
     cand = candidates.copy()
     if "party" not in cand.columns:
         return {}  # カラム不足の場合はスキップ
-    cand["party"] = cand["party"].replace({"無所属": "その他"})
+    cand["party"] = _independents_as_others(cand["party"])
 
     # 中道改革連合の候補者数を立憲民主党と公明党に加算
     # （中道改革連合 = 立憲 + 公明 の統一候補として出馬しているため）
@@ -596,9 +872,7 @@ def compute_candidate_caps(data):
         if smd_count > 0:
             # 比例: SMD候補の重複 + 比例単独を想定
             # 最低でも世論調査ベースラインの比例分は確保
-            baseline_pr = POLLING_BASELINE.get(party, 0) - round(
-                POLLING_BASELINE.get(party, 0) * HISTORICAL_SMD_RATIO.get(party, 0.5)
-            )
+            baseline_pr = int(BASELINE_PR_VEC[PARTY_INDEX[party]])
             pr_cap = max(smd_count * 3, baseline_pr, PR_SEATS // 4)
             pr_cap = min(pr_cap, PR_SEATS)
         else:
@@ -614,76 +888,69 @@ def apply_candidate_caps(results, caps):
     if not caps:
         return results
 
-    results = {p: dict(v) for p, v in results.items()}  # deep copy
-
-    # 超過分を計算
-    overflow = 0
-    capped_parties = set()
-    for party, r in results.items():
-        if party not in caps:
-            continue
-        cap = caps[party]
-
-        # 小選挙区の上限適用
-        if r["smd"] > cap["smd"]:
-            overflow += r["smd"] - cap["smd"]
-            r["smd"] = cap["smd"]
-            capped_parties.add(party)
-
-        # 比例代表の上限適用
-        if r["pr"] > cap["pr"]:
-            overflow += r["pr"] - cap["pr"]
-            r["pr"] = cap["pr"]
-            capped_parties.add(party)
-
-        r["total"] = r["smd"] + r["pr"]
+    # 政党ごとの値を results の並びの配列で持つ
+    parties = list(results)
+    n = len(parties)
+    smd = np.fromiter((results[p]["smd"] for p in parties), dtype=np.int64, count=n)
+    pr = np.fromiter((results[p]["pr"] for p in parties), dtype=np.int64, count=n)
+    totals = np.fromiter((results[p]["total"] for p in parties), dtype=np.int64, count=n)
+    has_cap = np.array([p in caps for p in parties], dtype=bool)
+    cap_smd = np.array([caps[p]["smd"] if p in caps else SMD_SEATS for p in parties], dtype=np.int64)
+    cap_pr = np.array([caps[p]["pr"] if p in caps else PR_SEATS for p in parties], dtype=np.int64)
+
+    # 超過分を計算（上限のある政党のみ SMD/PR を上限で切る）
+    over_smd = np.where(has_cap, np.maximum(smd - cap_smd, 0), 0)
+    over_pr = np.where(has_cap, np.maximum(pr - cap_pr, 0), 0)
+    capped = (over_smd > 0) | (over_pr > 0)
+    smd -= over_smd
+    pr -= over_pr
+    totals = np.where(has_cap, smd + pr, totals)
+    overflow = int(over_smd.sum() + over_pr.sum())
+
+    if overflow > 0:
+        # 超過分を、上限に達していない政党に配分
+        # 世論調査ベースラインの比率で配分（現在議席比例だと大政党に偏りすぎる）
+        eligible = np.flatnonzero(~capped & (totals > 0))
+        weights = np.array([POLLING_BASELINE.get(parties[i], 1) for i in eligible], dtype=float)
+        if weights.sum() == 0:
+            # 全政党がキャップ済みの場合、均等配分
+            eligible = np.flatnonzero(~capped)
+            weights = np.ones(len(eligible))
+
+        # 最大残余法で超過分を配分（残余が同じなら results の並びで先の政党を優先）
+        extra = np.zeros(n, dtype=np.int64)
+        if len(eligible):
+            raw_alloc = overflow * (weights / weights.sum())
+            alloc = raw_alloc.astype(np.int64)
+            leftover = overflow - int(alloc.sum())
+            if leftover > 0:
+                alloc[np.argsort(-(raw_alloc - alloc), kind="stable")[:leftover]] += 1
+            extra[eligible] = alloc
+
+        # 配分を適用（SMDとPRに歴史的比率で分割）
+        smd_ratio = np.array([HISTORICAL_SMD_RATIO.get(p, 0.5) for p in parties])
+        extra_smd = np.maximum(0, np.minimum(np.rint(extra * smd_ratio).astype(np.int64), cap_smd - smd))
+        extra_pr = extra - extra_smd
+        # 比例の上限チェック
+        over_cap = has_cap & (pr + extra_pr > cap_pr)
+        extra_pr = np.where(over_cap, np.maximum(0, cap_pr - pr), extra_pr)
+        extra_smd = np.where(
+            over_cap, np.maximum(0, np.minimum(extra - extra_pr, cap_smd - smd)), extra_smd
+        )
+        added = extra > 0
+        smd += np.where(added, extra_smd, 0)
+        pr += np.where(added, extra_pr, 0)
+        totals = np.where(added, smd + pr, totals)
+
+    # 配列は results から新規に作ったものなので、入力の辞書を複製せずに新しい辞書へ詰め直す
+    results = {
+        p: {"smd": int(smd[i]), "pr": int(pr[i]), "total": int(totals[i])}
+        for i, p in enumerate(parties)
+    }
 
     if overflow == 0:
         return results
 
-    # 超過分を、上限に達していない政党に配分
-    # 世論調査ベースラインの比率で配分（現在議席比例だと大政党に偏りすぎる）
-    eligible = {
-        p: POLLING_BASELINE.get(p, 1) for p in results
-        if p not in capped_parties and results[p]["total"] > 0
-    }
-    total_eligible = sum(eligible.values())
-
-    if total_eligible == 0:
-        # 全政党がキャップ済みの場合、均等配分
-        eligible = {p: 1 for p in results if p not in capped_parties}
-        total_eligible = len(eligible)
-
-    # 最大残余法で超過分を配分
-    raw_alloc = {p: overflow * (v / total_eligible) for p, v in eligible.items()}
-    alloc = {p: int(v) for p, v in raw_alloc.items()}
-    remainders = {p: raw_alloc[p] - alloc[p] for p in alloc}
-    leftover = overflow - sum(alloc.values())
-
-    for p in sorted(remainders, key=lambda x: remainders[x], reverse=True):
-        if leftover <= 0:
-            break
-        alloc[p] += 1
-        leftover -= 1
-
-    # 配分を適用（SMDとPRに歴史的比率で分割）
-    for party, extra in alloc.items():
-        if extra <= 0:
-            continue
-        smd_ratio = HISTORICAL_SMD_RATIO.get(party, 0.5)
-        cap = caps.get(party, {"smd": SMD_SEATS, "pr": PR_SEATS})
-        extra_smd = min(round(extra * smd_ratio), cap["smd"] - results[party]["smd"])
-        extra_smd = max(0, extra_smd)
-        extra_pr = extra - extra_smd
-        # 比例の上限チェック
-        if party in caps and results[party]["pr"] + extra_pr > caps[party]["pr"]:
-            extra_pr = max(0, caps[party]["pr"] - results[party]["pr"])
-            extra_smd = min(extra - extra_pr, cap["smd"] - results[party]["smd"])
-            extra_smd = max(0, extra_smd)
-        results[party]["smd"] += extra_smd
-        results[party]["pr"] += extra_pr
-        results[party]["total"] = results[party]["smd"] + results[party]["pr"]
-
     # 最終調整（端数で合計がずれた場合）
     results = adjust_model_total(results)
     return results
@@ -691,80 +958,72 @@ def apply_candidate_caps(results, caps):
 
 # === 配分アルゴリズム ===
 
-def dhondt_allocation(scores, total_seats):
-    """ドント方式による比例代表議席配分"""
-    seats = {party: 0 for party in scores}
-    for _ in range(total_seats):
-        quotients = {
-            party: scores[party] / (seats[party] + 1)
-            for party in scores if scores[party] > 0
-        }
-        if not quotients:
-            break
-        winner = max(quotients, key=quotients.get)
-        seats[winner] += 1
-    return seats
+def _dhondt_core(scores, total_seats):
+    """ドント方式の本体（配列版）: 全政党の商 得票/1, 得票/2, ... の上位 total_seats 個を議席とする
 
+    得票が0以下の政党は対象外。同じ商なら先頭側の政党を優先する（逐次配分と同じ結果）
+    """
+    n = len(scores)
+    if total_seats <= 0 or not (scores > 0).any():
+        return np.zeros(n, dtype=np.int64)
+    divisors = np.arange(1, total_seats + 1, dtype=np.float64)
+    quotients = np.where(
+        (scores > 0)[:, None], scores[:, None] / divisors[None, :], -np.inf
+    ).ravel()
+    party_idx = np.repeat(np.arange(n), total_seats)
+    top = np.lexsort((party_idx, -quotients))[:total_seats]
+    return np.bincount(party_idx[top], minlength=n)
 
-def cube_law_allocation(shares, total_seats):
-    """キューブ法則による小選挙区議席配分"""
-    adjusted = {p: s ** CUBE_EXPONENT for p, s in shares.items() if s > 0}
-    total_adj = sum(adjusted.values())
-    if total_adj == 0:
-        return {p: 0 for p in shares}
 
-    raw_seats = {p: (v / total_adj) * total_seats for p, v in adjusted.items()}
-    seats = {p: round(v) for p, v in raw_seats.items()}
-    for p in shares:
-        if p not in seats:
-            seats[p] = 0
+def dhondt_allocation(scores, total_seats):
+    """ドント方式による比例代表議席配分"""
+    parties = list(scores)
+    scores_arr = np.array([scores[p] for p in parties], dtype=np.float64)
+    seats = _dhondt_core(scores_arr, total_seats)
+    return {party: int(n) for party, n in zip(parties, seats)}
 
-    seats = adjust_to_total(seats, total_seats, raw_seats)
-    return seats
 
+def _cube_law_core(shares, total_seats):
+    """キューブ法則の本体（配列版）: シェアの CUBE_EXPONENT 乗に比例して配分し、
+    最大残余法で合計を total_seats に合わせる。シェアが0以下の政党は0議席
 
-def adjust_to_total(seats, target, raw_values=None):
-    """最大残余法で合計がtargetになるよう調整"""
-    current = sum(seats.values())
-    diff = target - current
-    if diff == 0:
-        return seats
+    残余が同じなら先頭側の政党（シェアが0以下の政党はシェア正の政党の後）を優先する
+    """
+    positive = shares > 0
+    adjusted = np.where(positive, shares, 0.0) ** CUBE_EXPONENT
+    # 合計は辞書版と同じく先頭から順に足す（np.sum のペアワイズ加算とは丸めが異なる）
+    total_adj = sum(adjusted[positive].tolist())
+    if total_adj == 0:
+        return np.zeros(len(shares), dtype=np.int64)
 
-    if raw_values:
-        remainders = {p: raw_values.get(p, 0) - seats[p] for p in seats}
-    else:
-        remainders = {p: 1.0 / (seats[p] + 1) for p in seats}
+    raw_seats = np.where(positive, adjusted / total_adj * total_seats, 0.0)
+    seats = np.rint(raw_seats).astype(np.int64)
 
-    sorted_parties = sorted(
-        remainders.keys(),
-        key=lambda p: remainders[p],
-        reverse=(diff > 0),
-    )
+    diff = total_seats - int(seats.sum())
+    if diff != 0:
+        remainders = raw_seats - seats
+        order = np.concatenate([np.flatnonzero(positive), np.flatnonzero(~positive)])
+        key = -remainders[order] if diff > 0 else remainders[order]
+        idx = order[np.argsort(key, kind="stable")][:abs(diff)]
+        seats[idx] = np.maximum(seats[idx] + (1 if diff > 0 else -1), 0)
+    return seats
 
-    for i in range(abs(diff)):
-        if i < len(sorted_parties):
-            p = sorted_parties[i]
-            seats[p] += 1 if diff > 0 else -1
-            seats[p] = max(0, seats[p])
 
-    return seats
+def cube_law_allocation(shares, total_seats):
+    """キューブ法則による小選挙区議席配分"""
+    parties = list(shares)
+    shares_arr = np.array([shares[p] for p in parties], dtype=np.float64)
+    seats = _cube_law_core(shares_arr, total_seats)
+    return {party: int(n) for party, n in zip(parties, seats)}
 
 
 # === 共通議席配分ヘルパー ===
 
 def allocate_youtube_seats(shares):
     """YouTubeシェアからSMD+PR議席を配分（Model 1/2共通）"""
-    komeito_smd = round(KOMEITO_SEATS * KOMEITO_SMD_RATIO)
-    komeito_pr = round(KOMEITO_SEATS * KOMEITO_PR_RATIO)
-    others_smd = round(OTHERS_SEATS * OTHERS_SMD_RATIO)
-    others_pr = round(OTHERS_SEATS * OTHERS_PR_RATIO)
-
-    pr_available = PR_SEATS - komeito_pr - others_pr
     pr_scores = {p: shares[p] * 1000 for p in YOUTUBE_PARTIES}
-    pr_seats = dhondt_allocation(pr_scores, pr_available)
-
-    smd_available = SMD_SEATS - komeito_smd - others_smd
-    smd_seats = cube_law_allocation(shares, smd_available)
+    pr_seats = dhondt_allocation(pr_scores, PR_AVAILABLE)
+    smd_seats = cube_law_allocation(shares, SMD_AVAILABLE)
 
     results = {}
     for party in YOUTUBE_PARTIES:
@@ -774,8 +1033,8 @@ def allocate_youtube_seats(shares):
             "total": smd_seats.get(party, 0) + pr_seats.get(party, 0),
         }
 
-    results["公明党"] = {"smd": komeito_smd, "pr": komeito_pr, "total": KOMEITO_SEATS}
-    results["その他"] = {"smd": others_smd, "pr": others_pr, "total": OTHERS_SEATS}
+    # adjust_model_total が dict を書き換えるので固定配分は複製して加える
+    results.update({p: dict(r) for p, r in FIXED_RESULTS.items()})
 
     results = adjust_model_total(results)
     return results
@@ -783,13 +1042,16 @@ def allocate_youtube_seats(shares):
 
 def allocate_by_historical_ratio(shares_dict):
     """歴史的SMD比率で分割する共通ヘルパー（Model 3/5共通）"""
-    results = {}
-    for party in ALL_PARTIES:
-        total_seats = round(shares_dict.get(party, 0) * TOTAL_SEATS)
-        smd_ratio = HISTORICAL_SMD_RATIO.get(party, 0.5)
-        smd = round(total_seats * smd_ratio)
-        pr = total_seats - smd
-        results[party] = {"smd": smd, "pr": pr, "total": total_seats}
+    # SMD比率はモジュール定数の SMD_RATIO_VEC を使い、全政党分を配列で一度に丸める
+    shares = np.fromiter(
+        (shares_dict.get(p, 0) for p in ALL_PARTIES), dtype=float, count=len(ALL_PARTIES)
+    )
+    totals = np.rint(shares * TOTAL_SEATS).astype(np.int64)
+    smds = np.rint(totals * SMD_RATIO_VEC).astype(np.int64)
+    results = {
+        party: {"smd": smd, "pr": total - smd, "total": total}
+        for party, smd, total in zip(ALL_PARTIES, smds.tolist(), totals.tolist())
+    }
 
     results = adjust_model_total(results)
     return results
@@ -797,105 +1059,154 @@ def allocate_by_historical_ratio(shares_dict):
 
 # === エンゲージメントスコア計算 ===
 
+def _prepare_videos(videos):
+    """動画に政党名を付け、投稿日時のない行を除く（投稿日時は読み込み時に datetime 化済み）"""
+    videos = videos.copy()
+    videos["party"] = _video_parties(videos)
+    return videos.dropna(subset=["published_at"])
+
+
+_NS_PER_SECOND = 1_000_000_000
+_NS_PER_DAY = 86400 * _NS_PER_SECOND
+
+
+def _datetime_ns(dates):
+    """datetime 列を UTC 基準のナノ秒整数配列と NaT でない位置のマスクにする"""
+    values = dates.to_numpy(dtype="datetime64[ns]")
+    return values.view("int64"), ~np.isnat(values)
+
+
+def _elapsed_days(dates, fill=np.nan):
+    """列内の最新日時から各日時までの経過日数（日未満は切り捨て。NaT の位置は fill）"""
+    ns, valid = _datetime_ns(dates)
+    if not valid.any():
+        return np.full(len(ns), fill, dtype=float)
+    return np.where(valid, (ns[valid].max() - ns) // _NS_PER_DAY, fill)
+
+
+def _time_weighted_stats(videos):
+    """_prepare_videos 済みの動画から時間減衰重み付き統計を政党別に計算"""
+    # 投票日までの日数（秒 → 日の順に割り、Timedelta.total_seconds 経由と同じ値にする）
+    published_ns, _ = _datetime_ns(videos["published_at"])
+    days_before = (ELECTION_DATE.value - published_ns) / _NS_PER_SECOND / 86400
+    time_weight = np.exp(-TIME_DECAY_LAMBDA * np.maximum(days_before, 0))
+
+    # 政党ごとのマスク走査ではなく1回の groupby で集計
+    weighted = pd.DataFrame({
+        "weighted_views": videos["view_count"] * time_weight,
+        "weighted_likes": videos["like_count"] * time_weight,
+    }).groupby(videos["party"], observed=True).sum()
+
+    return {
+        party: weighted.loc[party].to_dict()
+        for party in YOUTUBE_PARTIES if party in weighted.index
+    }
+
+
 def compute_time_weighted_stats(data):
     """動画の時間減衰重み付き統計を政党別に計算"""
     videos = data.get("videos", pd.DataFrame())
     if videos.empty:
         return {}
+    return _time_weighted_stats(_prepare_videos(videos))
 
-    videos = videos.copy()
-    videos["published_at"] = pd.to_datetime(videos["published_at"], errors="coerce")
-    videos["party"] = videos["title"].apply(extract_party_from_title)
-    videos = videos.dropna(subset=["published_at"])
 
-    days_before = (ELECTION_DATE - videos["published_at"]).dt.total_seconds() / 86400
-    videos["time_weight"] = np.exp(-TIME_DECAY_LAMBDA * days_before.clip(lower=0))
+# compute_engagement_scores の直近の入力フレームと結果（M1 と M7 で同じ data を使い回す）
+_ENGAGEMENT_CACHE = {"inputs": None, "scores": None}
 
-    party_weighted = {}
-    for party in YOUTUBE_PARTIES:
-        pv = videos[videos["party"] == party]
-        if pv.empty:
-            continue
-        party_weighted[party] = {
-            "weighted_views": (pv["view_count"] * pv["time_weight"]).sum(),
-            "weighted_likes": (pv["like_count"] * pv["time_weight"]).sum(),
-        }
 
-    return party_weighted
+def compute_engagement_scores(data):
+    """各政党のエンゲージメントスコアを計算（同一の入力フレームならキャッシュを返す）"""
+    inputs = (data["channels"], data["party_stats"], data["videos"])
+    cached = _ENGAGEMENT_CACHE["inputs"]
+    if cached is not None and all(a is b for a, b in zip(cached, inputs)):
+        return dict(_ENGAGEMENT_CACHE["scores"])
 
+    scores = _compute_engagement_scores(data)
+    _ENGAGEMENT_CACHE.update(inputs=inputs, scores=scores)
+    return dict(scores)
 
-def compute_engagement_scores(data):
+
+def _compute_engagement_scores(data):
     """各政党のエンゲージメントスコアを計算（時間減衰・成長率付き）"""
     channels = data["channels"].dropna(subset=["party_name"])
     party_stats = data["party_stats"]
     videos = data["videos"]
 
-    time_weighted = compute_time_weighted_stats(data)
+    # 投稿日時の変換・政党抽出は時間減衰統計と成長率で共用する
+    vc = _prepare_videos(videos) if not videos.empty else None
+    time_weighted = _time_weighted_stats(vc) if vc is not None else {}
 
     # 成長率計算: 後半期間 vs 前半期間
     growth_rates = {}
-    if not videos.empty and "published_at" in videos.columns:
-        vc = videos.copy()
-        vc["published_at"] = pd.to_datetime(vc["published_at"], errors="coerce")
-        vc["party"] = vc["title"].apply(extract_party_from_title)
-        vc = vc.dropna(subset=["published_at"])
+    if vc is not None:
         midpoint = vc["published_at"].min() + (vc["published_at"].max() - vc["published_at"].min()) / 2
-        for party in YOUTUBE_PARTIES:
-            pv = vc[vc["party"] == party]
-            early = pv[pv["published_at"] <= midpoint]["view_count"].sum()
-            late = pv[pv["published_at"] > midpoint]["view_count"].sum()
-            growth_rates[party] = late / early if early > 0 else 1.0
-
-    scores = {}
-    for party in YOUTUBE_PARTIES:
-        ch = channels[channels["party_name"] == party]
-        ps = party_stats[party_stats["party_name"] == party]
-
-        if ch.empty or ps.empty:
-            scores[party] = 0.0
-            continue
-
-        ch = ch.iloc[0]
-        ps = ps.iloc[0]
-
-        tw = time_weighted.get(party, {})
-        scores[party] = {
-            "subscribers": ch["subscriber_count"],
-            "channel_views": ch["view_count"],
-            "campaign_views": tw.get("weighted_views", ps["total_views"]),
-            "campaign_likes": tw.get("weighted_likes", ps["total_likes"]),
-            "avg_views": ps["avg_views"],
-            "growth_rate": growth_rates.get(party, 1.0),
-        }
+        # 政党 × 後半期間かどうか で再生回数を一度に集計
+        views = (
+            vc.groupby(["party", vc["published_at"] > midpoint], observed=True)["view_count"].sum()
+            .unstack(fill_value=0)
+            .reindex(index=YOUTUBE_PARTIES, columns=[False, True], fill_value=0)
+        )
+        # 前半の再生がない政党は成長率 1.0
+        early = views[False].to_numpy(dtype=float)
+        late = views[True].to_numpy(dtype=float)
+        rates = np.divide(late, early, out=np.ones_like(early), where=early > 0)
+        growth_rates = dict(zip(YOUTUBE_PARTIES, rates))
+
+    # 政党ごとの先頭行を YOUTUBE_PARTIES の並びに揃え、指標を (政党, 指標) 行列にまとめる
+    ch = channels.drop_duplicates("party_name").set_index("party_name")
+    ps = party_stats.drop_duplicates("party_name").set_index("party_name")
+    present = [p for p in YOUTUBE_PARTIES if p in ch.index and p in ps.index]
+    if not present:
+        return {p: 0.0 for p in YOUTUBE_PARTIES}
+    ch = ch.loc[present]
+    ps = ps.loc[present]
+
+    columns = {
+        "subscribers": ch["subscriber_count"].to_numpy(dtype=float),
+        "channel_views": ch["view_count"].to_numpy(dtype=float),
+        "campaign_views": np.array([
+            time_weighted.get(p, {}).get("weighted_views", v)
+            for p, v in zip(present, ps["total_views"])
+        ], dtype=float),
+        "campaign_likes": np.array([
+            time_weighted.get(p, {}).get("weighted_likes", v)
+            for p, v in zip(present, ps["total_likes"])
+        ], dtype=float),
+        "avg_views": ps["avg_views"].to_numpy(dtype=float),
+        "growth_rate": np.array([growth_rates.get(p, 1.0) for p in present]),
+    }
 
-    # 正規化してスコア算出
+    # 指標ごとの最大値で正規化し、重み付き和をとる（最大値が0の指標は正規化しない）
+    # 和は行ごとに指標の順で足す（@ は BLAS の加算順になり末尾の桁が変わりうる）
     metrics = list(ENGAGEMENT_WEIGHTS.keys())
-    max_vals = {}
-    for m in metrics:
-        vals = [s[m] for s in scores.values() if isinstance(s, dict)]
-        max_vals[m] = max(vals) if vals else 1
-
-    final_scores = {}
-    for party, s in scores.items():
-        if isinstance(s, dict):
-            composite = sum(
-                ENGAGEMENT_WEIGHTS[m] * (s[m] / max_vals[m])
-                for m in metrics
-            )
-            final_scores[party] = composite
-        else:
-            final_scores[party] = 0.0
-
+    X = np.column_stack([columns[m] for m in metrics])
+    weights = np.array([ENGAGEMENT_WEIGHTS[m] for m in metrics])
+    max_vals = X.max(axis=0)
+    max_vals = np.where(max_vals > 0, max_vals, 1.0)
+    composite = (weights * (X / max_vals)).sum(axis=1)
+
+    final_scores = dict.fromkeys(YOUTUBE_PARTIES, 0.0)
+    final_scores.update(zip(present, composite.tolist()))
     return final_scores
 
 
 def scores_to_shares(scores):
-    """スコアをシェア（合計1.0）に変換"""
-    total = sum(scores.values())
+    """スコアをシェア（合計1.0）に変換
+
+    結果は読み取り専用のマッピングで、同じスコアならキャッシュ済みのものをそのまま返す
+    """
+    return _scores_to_shares(tuple(scores.items()))
+
+
+@functools.lru_cache(maxsize=64)
+def _scores_to_shares(items):
+    """scores_to_shares の本体（(政党, スコア) のタプルをキーにメモ化）"""
+    total = sum(v for _, v in items)
     if total == 0:
-        n = len(scores)
-        return {p: 1.0 / n for p in scores}
-    return {p: v / total for p, v in scores.items()}
+        n = len(items)
+        return types.MappingProxyType({p: 1.0 / n for p, _ in items})
+    return types.MappingProxyType({p: v / total for p, v in items})
 
 
 # === Model 1: YouTubeエンゲージメントシェアモデル ===
@@ -926,54 +1237,67 @@ def model2_sentiment_weighted(data, base_scores):
 
 # === Model 3: 世論調査 + YouTubeモメンタムモデル ===
 
+# _get_weighted_poll_shares の直近の入力フレームと結果（M3・M5・M7 で同じ data を使い回す）
+_POLL_SHARES_CACHE = {"polling": None, "shares": None}
+
+
 def _get_weighted_poll_shares(data):
-    """世論調査の時系列加重平均を算出（最新調査を重視）"""
+    """世論調査の時系列加重平均を算出（同一の入力フレームならキャッシュを返す）
+
+    結果は読み取り専用のマッピング（データがなければ POLLING_SHARES）
+    """
     polling = data.get("news_polling", pd.DataFrame())
     if polling.empty:
-        return {p: v / TOTAL_SEATS for p, v in POLLING_BASELINE.items()}
+        return POLLING_SHARES
+    if _POLL_SHARES_CACHE["polling"] is not polling:
+        _POLL_SHARES_CACHE.update(polling=polling, shares=_compute_weighted_poll_shares(polling))
+    return _POLL_SHARES_CACHE["shares"]
 
-    polling = polling.copy()
-    polling["survey_date"] = pd.to_datetime(polling["survey_date"])
-    latest_date = polling["survey_date"].max()
 
-    days_ago = (latest_date - polling["survey_date"]).dt.days
-    polling["weight"] = np.exp(-np.log(2) * days_ago / POLL_DECAY_HALF_LIFE_DAYS)
+def _compute_weighted_poll_shares(polling):
+    """世論調査の時系列加重平均を算出（最新調査を重視）"""
+    # 元の DataFrame は書き換えず、日付・重みはローカルの Series で持つ
+    days_ago = _elapsed_days(polling["survey_date"])
+    weight = np.exp(-np.log(2) * days_ago / POLL_DECAY_HALF_LIFE_DAYS)
 
     if "sample_size" in polling.columns:
-        polling["weight"] *= np.sqrt(polling["sample_size"].fillna(1000) / 1000)
-
-    weighted_rates = {}
-    for party in polling["party_name"].unique():
-        if party == "支持なし":
-            continue
-        pm = polling[polling["party_name"] == party]
-        if pm["weight"].sum() > 0:
-            weighted_rates[party] = (pm["support_rate"] * pm["weight"]).sum() / pm["weight"].sum()
+        weight = weight * np.sqrt(polling["sample_size"].fillna(1000) / 1000)
+
+    # 政党別の重み付き平均支持率（「支持なし」の行は集計前に除外）
+    keep = (polling["party_name"] != "支持なし").to_numpy()
+    by_party = (
+        pd.DataFrame({
+            "party_name": polling["party_name"][keep],
+            "weighted_rate": (polling["support_rate"] * weight)[keep],
+            "weight": weight[keep],
+        })
+        .groupby("party_name", sort=False, observed=True)[["weighted_rate", "weight"]].sum()
+    )
+    by_party = by_party[by_party["weight"] > 0]
+    weighted_rates = (by_party["weighted_rate"] / by_party["weight"]).to_dict()
 
     total = sum(weighted_rates.values())
     if total > 0:
-        return {p: v / total for p, v in weighted_rates.items()}
+        return types.MappingProxyType({p: v / total for p, v in weighted_rates.items()})
 
-    return {p: v / TOTAL_SEATS for p, v in POLLING_BASELINE.items()}
+    return POLLING_SHARES
 
 
 def model3_polling_momentum(data, youtube_shares):
     """世論調査ベースラインにYouTubeの勢いで補正（時系列加重対応）"""
     polling_shares = _get_weighted_poll_shares(data)
 
-    blended_shares = {}
-    for party in ALL_PARTIES:
-        ps = polling_shares.get(party, POLLING_BASELINE.get(party, 0) / TOTAL_SEATS)
-        if party in YOUTUBE_PARTIES and party in youtube_shares:
-            momentum = youtube_shares[party] - ps
-            momentum = max(-MOMENTUM_CLAMP, min(MOMENTUM_CLAMP, momentum))
-            blended = POLLING_WEIGHT * ps + YOUTUBE_WEIGHT * (ps + momentum)
-        else:
-            blended = ps
-        blended_shares[party] = blended
+    baseline_shares = POLLING_BASELINE_VEC / TOTAL_SEATS
+    ps = np.array([polling_shares.get(p, b) for p, b in zip(ALL_PARTIES, baseline_shares)])
+    has_youtube = np.array([p in YOUTUBE_PARTIES and p in youtube_shares for p in ALL_PARTIES])
+    youtube_vec = np.array([youtube_shares.get(p, 0.0) for p in ALL_PARTIES])
 
-    total = sum(blended_shares.values())
-    blended_shares = {p: v / total for p, v in blended_shares.items()}
+    momentum = np.clip(youtube_vec - ps, -MOMENTUM_CLAMP, MOMENTUM_CLAMP)
+    blended = np.where(
+        has_youtube, POLLING_WEIGHT * ps + YOUTUBE_WEIGHT * (ps + momentum), ps
+    )
+    blended = blended / blended.sum()
+    blended_shares = dict(zip(ALL_PARTIES, blended.tolist()))
 
     results = allocate_by_historical_ratio(blended_shares)
     return results, blended_shares
@@ -981,37 +1305,56 @@ def model3_polling_momentum(data, youtube_shares):
 
 # === Model 4: アンサンブル ===
 
-def model4_ensemble(m1_results, m2_results, m3_results):
-    """3モデルの加重平均"""
-    results = {}
-    for party in ALL_PARTIES:
-        m1 = m1_results.get(party, {"total": 0, "smd": 0, "pr": 0})
-        m2 = m2_results.get(party, {"total": 0, "smd": 0, "pr": 0})
-        m3 = m3_results.get(party, {"total": 0, "smd": 0, "pr": 0})
-
-        total = (ENSEMBLE_WEIGHTS["model1"] * m1["total"]
-                 + ENSEMBLE_WEIGHTS["model2"] * m2["total"]
-                 + ENSEMBLE_WEIGHTS["model3"] * m3["total"])
-        smd = (ENSEMBLE_WEIGHTS["model1"] * m1["smd"]
-               + ENSEMBLE_WEIGHTS["model2"] * m2["smd"]
-               + ENSEMBLE_WEIGHTS["model3"] * m3["smd"])
-        pr = (ENSEMBLE_WEIGHTS["model1"] * m1["pr"]
-              + ENSEMBLE_WEIGHTS["model2"] * m2["pr"]
-              + ENSEMBLE_WEIGHTS["model3"] * m3["pr"])
+_SEAT_FIELDS = ("total", "smd", "pr")
+# 結果に無い政党の代わりに引く共有の 0 議席（呼び出しごとに dict を作らない）
+_NO_SEATS = types.MappingProxyType(dict.fromkeys(_SEAT_FIELDS, 0))
+
+
+def _stack_results(results_list):
+    """モデル結果の dict 群を (政党, モデル, 項目) の配列にまとめる"""
+    shape = (len(ALL_PARTIES), len(results_list), len(_SEAT_FIELDS))
+    # 入れ子のリストを作らず、政党→モデル→項目の順に1本の配列へ流し込む
+    flat = np.fromiter(
+        (
+            r.get(party, _NO_SEATS)[k]
+            for party in ALL_PARTIES for r in results_list for k in _SEAT_FIELDS
+        ),
+        dtype=float, count=shape[0] * shape[1] * shape[2],
+    )
+    return flat.reshape(shape)
 
-        results[party] = {
-            "total": round(total),
-            "smd": round(smd),
-            "pr": round(pr),
-        }
 
-    results = adjust_model_total(results)
-    for party in results:
-        diff = results[party]["total"] - (results[party]["smd"] + results[party]["pr"])
-        if diff != 0:
-            results[party]["pr"] += diff
+def _blend_results(results_list, weights):
+    """モデル結果の加重和を (政党, 項目) の配列で返す"""
+    return np.einsum("m,pmf->pf", np.asarray(weights, dtype=float), _stack_results(results_list))
 
-    return results
+
+def _seats_to_results(seats):
+    """(政党, 項目) の議席配列を整数化して政党別 dict に戻す
+
+    total を四捨五入し、その議席を SMD/PR の比で最大剰余法（Hamilton）により分ける。
+    2区分の最大剰余法は SMD の割当量の四捨五入と同じなので、smd + pr == total が常に成り立つ
+    """
+    total_f, smd_f, pr_f = seats.T
+    total = np.rint(total_f).astype(int)
+    split = smd_f + pr_f
+    smd_quota = np.divide(smd_f * total, split, out=np.zeros_like(split), where=split > 0)
+    smd = np.clip(np.rint(smd_quota).astype(int), 0, np.maximum(total, 0))
+    rounded = np.column_stack([total, smd, total - smd])
+    return {
+        party: {k: int(v) for k, v in zip(_SEAT_FIELDS, row)}
+        for party, row in zip(ALL_PARTIES, rounded)
+    }
+
+
+def model4_ensemble(m1_results, m2_results, m3_results):
+    """3モデルの加重平均"""
+    weights = [ENSEMBLE_WEIGHTS[f"model{i}"] for i in (1, 2, 3)]
+    results = _seats_to_results(
+        _blend_results([m1_results, m2_results, m3_results], weights)
+    )
+
+    return adjust_model_total(results)
 
 
 # === Model 5: ニュース記事モデル（信頼度・時間減衰・メディア言及対応）===
@@ -1019,49 +1362,47 @@ def model4_ensemble(m1_results, m2_results, m3_results):
 def compute_news_scores(data):
     """ニュース記事の報道量・トーンから政党スコアを算出（信頼度・時間減衰付き）"""
     articles = data.get("news_articles", pd.DataFrame())
-    polling = data.get("news_polling", pd.DataFrame())
     media_mentions = data.get("media_mentions", pd.DataFrame())
 
     coverage_scores = {}
     tone_scores = {}
 
     if not articles.empty:
-        articles = articles.copy()
-        articles["published_at"] = pd.to_datetime(articles["published_at"], errors="coerce")
-        latest = articles["published_at"].max()
-
-        days_ago = (latest - articles["published_at"]).dt.days.fillna(0)
-        articles["recency_weight"] = np.exp(-np.log(2) * days_ago / RECENCY_HALF_LIFE_DAYS)
+        # 重みはローカルの Series で計算し、記事テーブルはコピー・列追加せず1回だけ走査する
+        days_ago = _elapsed_days(articles["published_at"], fill=0)
+        recency_weight = np.exp(-np.log(2) * days_ago / RECENCY_HALF_LIFE_DAYS)
 
         if "credibility_score" in articles.columns:
-            articles["cred_weight"] = articles["credibility_score"].fillna(3.0) / 5.0
+            cred_weight = articles["credibility_score"].fillna(3.0).to_numpy(dtype=float) / 5.0
         else:
-            articles["cred_weight"] = 1.0
-
-        articles["combined_weight"] = (
-            articles["page_views"].fillna(0)
-            * articles["recency_weight"]
-            * articles["cred_weight"]
-        )
+            cred_weight = 1.0
 
-        party_rows = []
-        for idx, row in articles.iterrows():
-            parties = str(row.get("mentioned_parties", "")).split("|")
-            for party in parties:
-                if party and party != "nan":
-                    party_rows.append({
-                        "party": party,
-                        "weighted_pv": row["combined_weight"],
-                        "tone_weighted": row.get("tone", 0) * row["recency_weight"] * row["cred_weight"],
-                        "count": 1,
-                    })
-
-        if party_rows:
-            df_party = pd.DataFrame(party_rows)
-            agg = df_party.groupby("party").agg(
+        # 言及政党を '|' で分割して1行1政党に展開し、報道量・トーンを1回の groupby で集計
+        # 展開するのは政党名の列だけで、記事ごとの重み付き値は元の記事インデックスで引く
+        if "mentioned_parties" in articles.columns:
+            mentioned = _explode_mentions(articles["mentioned_parties"])
+        else:
+            mentioned = pd.Series(dtype=object)
+        # ALL_PARTIES をカテゴリとする型に変換し、空文字・対象外の政党名を NaN として除外
+        mentioned = mentioned.astype(pd.CategoricalDtype(ALL_PARTIES)).dropna()
+        # 記事ごとの重み付き値は NumPy 配列で計算し、2つ目の積は in-place で重ねて中間配列を減らす
+        tone = articles["tone"].to_numpy(dtype=float) if "tone" in articles.columns else 0
+        weighted_pv = articles["page_views"].fillna(0).to_numpy(dtype=float) * recency_weight
+        weighted_pv *= cred_weight
+        tone_weighted = tone * recency_weight
+        tone_weighted *= cred_weight
+        pos = articles.index.get_indexer(mentioned.index)
+        df_party = pd.DataFrame({
+            "party": mentioned,
+            "weighted_pv": weighted_pv[pos],
+            "tone_weighted": tone_weighted[pos],
+        })
+
+        if not df_party.empty:
+            agg = df_party.groupby("party", observed=True).agg(
                 total_weighted_pv=("weighted_pv", "sum"),
                 total_weighted_tone=("tone_weighted", "sum"),
-                article_count=("count", "sum"),
+                article_count=("party", "size"),
             )
             coverage_scores = agg["total_weighted_pv"].to_dict()
             tone_scores = (agg["total_weighted_tone"] / agg["article_count"]).to_dict()
@@ -1074,8 +1415,9 @@ def compute_news_scores(data):
     if not media_mentions.empty:
         total_media = media_mentions["media_mention_views"].sum()
         if total_media > 0:
-            for _, row in media_mentions.iterrows():
-                media_scores[row["party_name"]] = row["media_mention_views"] / total_media
+            media_scores = (
+                media_mentions.set_index("party_name")["media_mention_views"] / total_media
+            ).to_dict()
 
     return coverage_scores, tone_scores, poll_scores, media_scores
 
@@ -1107,7 +1449,7 @@ def model5_news_prediction(data):
 
     for party in ALL_PARTIES:
         if party not in combined_scores:
-            combined_scores[party] = POLLING_BASELINE.get(party, 0) / TOTAL_SEATS * 0.5
+            combined_scores[party] = POLLING_FALLBACK[party]
 
     total = sum(combined_scores.values())
     if total > 0:
@@ -1133,96 +1475,78 @@ def model6_combined_ensemble(m4_results, m5_results):
     w5 = COMBINED_ENSEMBLE_WEIGHTS["model5"]
 
     # Step 1: M4+M5 の加重平均
-    raw_results = {}
-    for party in ALL_PARTIES:
-        m4 = m4_results.get(party, {"total": 0, "smd": 0, "pr": 0})
-        m5 = m5_results.get(party, {"total": 0, "smd": 0, "pr": 0})
-
-        total = w4 * m4["total"] + w5 * m5["total"]
-        smd = w4 * m4["smd"] + w5 * m5["smd"]
-        pr = w4 * m4["pr"] + w5 * m5["pr"]
-
-        raw_results[party] = {
-            "total": total,
-            "smd": smd,
-            "pr": pr,
-        }
+    raw = _blend_results([m4_results, m5_results], [w4, w5])
 
     # Step 2: 世論調査ベースラインへのアンカリング
     # データ駆動の予測と世論調査ベースラインの加重平均をとる
     wa = POLLING_ANCHOR_WEIGHT
-    results = {}
-    for party in ALL_PARTIES:
-        raw = raw_results[party]
-        bl_total = POLLING_BASELINE.get(party, 0)
-        bl_smd = round(bl_total * HISTORICAL_SMD_RATIO.get(party, 0.5))
-        bl_pr = bl_total - bl_smd
+    baseline = np.column_stack([POLLING_BASELINE_VEC, BASELINE_SMD_VEC, BASELINE_PR_VEC])
+    results = _seats_to_results((1 - wa) * raw + wa * baseline)
 
-        results[party] = {
-            "total": round((1 - wa) * raw["total"] + wa * bl_total),
-            "smd": round((1 - wa) * raw["smd"] + wa * bl_smd),
-            "pr": round((1 - wa) * raw["pr"] + wa * bl_pr),
-        }
+    return adjust_model_total(results)
 
-    results = adjust_model_total(results)
-    for party in results:
-        diff = results[party]["total"] - (results[party]["smd"] + results[party]["pr"])
-        if diff != 0:
-            results[party]["pr"] += diff
 
-    return results
+def _round_robin_counts(n, n_steps):
+    """n 件を先頭から順に1ずつ n_steps 回巡回して割り当てたときの各位置の回数"""
+    counts = np.full(n, n_steps // n if n else 0, dtype=np.int64)
+    counts[:n_steps % n if n else 0] += 1
+    return counts
 
 
 def adjust_model_total(results):
     """最大残余法で全モデル結果の合計を465に調整し、SMD/PRの内訳も289/176に合わせる"""
-    # Step 1: Total を 465 に調整
-    current = sum(r["total"] for r in results.values())
-    diff = TOTAL_SEATS - current
-    if diff != 0:
-        sorted_parties = sorted(results.keys(), key=lambda p: results[p]["total"], reverse=True)
-        for i in range(abs(diff)):
-            p = sorted_parties[i % len(sorted_parties)]
-            adj = 1 if diff > 0 else -1
-            results[p]["total"] += adj
-            if results[p]["smd"] > results[p]["pr"]:
-                results[p]["smd"] += adj
-            else:
-                results[p]["pr"] += adj
+    parties = list(results)
+    n = len(parties)
+    totals = np.fromiter((results[p]["total"] for p in parties), dtype=np.int64, count=n)
+    smd = np.fromiter((results[p]["smd"] for p in parties), dtype=np.int64, count=n)
+    pr = np.fromiter((results[p]["pr"] for p in parties), dtype=np.int64, count=n)
+
+    # Step 1: Total を 465 に調整（議席の多い順に1ずつ巡回して加減算）
+    # 各政党の加減回数は巡回の回数から閉じた形で求める。1回ごとに SMD > PR なら SMD、
+    # そうでなければ PR を動かすので、増やす場合は最初に選ばれた側だけが増え、
+    # 減らす場合は多い側を同数になるまで減らしてから PR → SMD の順に交互に減る
+    diff = TOTAL_SEATS - int(totals.sum())
+    if diff != 0 and n:
+        order = np.argsort(-totals, kind="stable")
+        counts = np.zeros(n, dtype=np.int64)
+        counts[order] = _round_robin_counts(n, abs(diff))
+        if diff > 0:
+            to_smd = smd > pr
+            smd += np.where(to_smd, counts, 0)
+            pr += np.where(to_smd, 0, counts)
+        else:
+            # 同数（PR 側の手番）になるまでに多い側から減らす回数
+            smd_first = smd > pr
+            gap = np.where(smd_first, smd - pr, pr - smd + 1)
+            head = np.minimum(counts, gap)
+            rest = counts - head
+            # 残りは交互に減らす（SMD が多かった政党は PR から、そうでなければ SMD から）
+            first_half = (rest + 1) // 2
+            second_half = rest // 2
+            smd -= np.where(smd_first, head + second_half, first_half)
+            pr -= np.where(smd_first, first_half, head + second_half)
+        totals += np.sign(diff) * counts
 
     # Step 2: SMD 合計を 289 に、PR 合計を 176 に調整
     # total は維持しつつ、各政党の SMD/PR 配分を微調整する
-    smd_total = sum(r["smd"] for r in results.values())
-    smd_diff = SMD_SEATS - smd_total  # 289 - 現在のSMD合計
+    smd_diff = SMD_SEATS - int(smd.sum())  # 289 - 現在のSMD合計
 
     if smd_diff != 0:
-        # SMDを増やす(smd_diff > 0)か減らす(smd_diff < 0)必要がある
-        # SMDを増やす場合: PRが多い（SMD比率が低い）政党からPR→SMDにシフト
-        # SMDを減らす場合: SMDが多い（SMD比率が高い）政党からSMD→PRにシフト
-        if smd_diff > 0:
-            # PRからSMDへシフト: PR/total比率が高い政党を優先
-            candidates = sorted(
-                [p for p in results if results[p]["pr"] > 0],
-                key=lambda p: results[p]["pr"] / max(results[p]["total"], 1),
-                reverse=True,
-            )
-        else:
-            # SMDからPRへシフト: SMD/total比率が高い政党を優先
-            candidates = sorted(
-                [p for p in results if results[p]["smd"] > 0],
-                key=lambda p: results[p]["smd"] / max(results[p]["total"], 1),
-                reverse=True,
-            )
-
-        for i in range(abs(smd_diff)):
-            if not candidates:
-                break
-            p = candidates[i % len(candidates)]
-            if smd_diff > 0 and results[p]["pr"] > 0:
-                results[p]["smd"] += 1
-                results[p]["pr"] -= 1
-            elif smd_diff < 0 and results[p]["smd"] > 0:
-                results[p]["smd"] -= 1
-                results[p]["pr"] += 1
+        # SMDを増やす(smd_diff > 0)場合: PR/total比率が高い政党からPR→SMDにシフト
+        # SMDを減らす(smd_diff < 0)場合: SMD/total比率が高い政党からSMD→PRにシフト
+        # 巡回で回ってきても移せる議席（src）が尽きた政党は飛ばす
+        src, dst = (pr, smd) if smd_diff > 0 else (smd, pr)
+        eligible = np.flatnonzero(src > 0)
+        ratio = src[eligible] / np.maximum(totals[eligible], 1)
+        candidates = eligible[np.argsort(-ratio, kind="stable")]
+        moved = np.minimum(_round_robin_counts(len(candidates), abs(smd_diff)), src[candidates])
+        src[candidates] -= moved
+        dst[candidates] += moved
+
+    for i, p in enumerate(parties):
+        results[p]["total"] = int(totals[i])
+        results[p]["smd"] = int(smd[i])
+        results[p]["pr"] = int(pr[i])
 
     return results
 
@@ -1241,43 +1565,73 @@ def _compute_candidate_composite_scores(cand, polling_shares):
     """
     w = DISTRICT_SIGNAL_WEIGHTS
 
+    def signal(column, default):
+        values = cand[column].to_numpy(dtype=float)
+        return np.where(np.isnan(values), default, values)
+
     # 1. partisan_lean: 前回選挙区結果ベースの党派性（最重要変数）
-    partisan_lean_signal = cand["partisan_lean"].fillna(0.10)
+    partisan_lean_signal = signal("partisan_lean", 0.10)
 
     # 2. polling_swing: 世論調査の支持率変動
-    polling_swing_signal = cand["polling_swing"].fillna(0.0)
+    polling_swing_signal = signal("polling_swing", 0.0)
     # スイングを0-1スケールに正規化 (-0.2 ~ +0.2 → 0.0 ~ 0.4)
-    polling_swing_normalized = (polling_swing_signal + 0.2).clip(0.0, 0.4)
+    polling_swing_normalized = np.clip(polling_swing_signal + 0.2, 0.0, 0.4)
 
     # 3. candidate_strength: 候補者の個人的強さ（区分ベース）
-    candidate_strength_signal = cand["candidate_strength"].fillna(0.03)
+    candidate_strength_signal = signal("candidate_strength", 0.03)
 
     # 4. incumbency: 現職ボーナス（日本では控えめ）
-    incumbency_signal = cand["incumbency"].fillna(0.0)
+    incumbency_signal = signal("incumbency", 0.0)
 
     # 5. youtube_score: YouTubeエンゲージメント（0-1）
-    yt_signal = cand["youtube_score"].fillna(0)
+    yt_signal = signal("youtube_score", 0)
 
     # 6. news_score: ニュース言及（0-1に正規化）
     max_news = cand["news_mentions"].max()
-    news_signal = cand["news_mentions"].fillna(0) / max(max_news, 1)
-
-    composite = (
-        w["partisan_lean"] * partisan_lean_signal
-        + w["polling_swing"] * polling_swing_normalized
-        + w["candidate_strength"] * candidate_strength_signal
-        + w["incumbency"] * incumbency_signal
-        + w["youtube_score"] * yt_signal
-        + w["news_score"] * news_signal
-    )
+    news_signal = signal("news_mentions", 0) / max(max_news, 1)
+
+    # 出力配列を1つだけ確保し、項の順に in-place で加算する（加算順は従来の式と同じ）
+    composite = w["partisan_lean"] * partisan_lean_signal
+    composite += w["polling_swing"] * polling_swing_normalized
+    composite += w["candidate_strength"] * candidate_strength_signal
+    composite += w["incumbency"] * incumbency_signal
+    composite += w["youtube_score"] * yt_signal
+    composite += w["news_score"] * news_signal
     return composite
 
 
+def _rank_within_groups(group_codes, values):
+    """グループ内の降順順位（同点は出現順）と、各行のグループ1位・2位の値を返す
+
+    (グループ, 値の降順) で1回だけ安定ソートし、ソート後の連続区間から順位と上位2つを得る。
+    2位がいない（1人だけの）グループの2位は 0。
+    """
+    n = len(values)
+    order = np.lexsort((-values, group_codes))
+    sorted_codes = group_codes[order]
+    sorted_values = values[order]
+    starts = np.ones(n, dtype=bool)
+    starts[1:] = sorted_codes[1:] != sorted_codes[:-1]
+    start_pos = np.flatnonzero(starts)
+    group_id = np.cumsum(starts) - 1
+
+    has_second = np.append(start_pos[1:], n) - start_pos > 1
+    second_of_group = np.where(has_second, sorted_values[np.minimum(start_pos + 1, n - 1)], 0.0)
+
+    rank = np.empty(n, dtype=int)
+    rank[order] = np.arange(n) - start_pos[group_id] + 1
+    top = np.empty(n)
+    top[order] = sorted_values[start_pos][group_id]
+    second = np.empty(n)
+    second[order] = second_of_group[group_id]
+    return rank, top, second
+
+
 def model7_district_prediction(data, polling_shares=None):
     """選挙区ごとの予測優勢をもとに議席配分を予測（ボトムアップ方式）"""
     candidates = data.get("candidates", pd.DataFrame())
     if polling_shares is None:
-        polling_shares = {p: v / TOTAL_SEATS for p, v in POLLING_BASELINE.items()}
+        polling_shares = POLLING_SHARES
 
     if candidates.empty:
         # フォールバック: 世論調査ベースで配分
@@ -1289,33 +1643,25 @@ def model7_district_prediction(data, polling_shares=None):
     # 各候補者の複合スコアを計算
     cand["composite_score"] = _compute_candidate_composite_scores(cand, polling_shares)
 
-    # 選挙区キー
+    # 選挙区キー（以降の groupby を整数コードで行うためカテゴリ型にする）
     cand["district_key"] = (
         cand["prefecture_code"].astype(str) + "_" + cand["district_number"].astype(str)
-    )
-
-    # 選挙区内で順位付け
-    cand["model7_rank"] = cand.groupby("district_key")["composite_score"].rank(
-        ascending=False, method="first"
-    ).astype(int)
+    ).astype("category")
 
-    # マージン計算
-    max_scores = cand.groupby("district_key")["composite_score"].transform("max")
-    second_scores = cand.groupby("district_key")["composite_score"].apply(
-        lambda x: x.nlargest(2).iloc[-1] if len(x) >= 2 else 0
-    )
-    second_map = second_scores.to_dict()
-    cand["model7_margin"] = cand.apply(
-        lambda row: row["composite_score"] - second_map.get(row["district_key"], 0)
-        if row["model7_rank"] == 1
-        else max_scores[row.name] - row["composite_score"],
-        axis=1,
+    # 選挙区内で順位付けし、同じソートから1位・2位のスコアも得る（候補者1人の選挙区の2位は 0）
+    score = cand["composite_score"].to_numpy()
+    rank, max_scores, second_scores = _rank_within_groups(
+        cand["district_key"].cat.codes.to_numpy(), score
     )
+    cand["model7_rank"] = rank
+
+    # マージン計算（1位は2位との差、それ以外は1位との差）
+    cand["model7_margin"] = np.where(rank == 1, score - second_scores, max_scores - score)
 
     # SMD議席集計
     # 中道改革連合の当選者を立憲民主党と公明党に振り分ける
     winners = cand[cand["model7_rank"] == 1].copy()
-    winner_parties = winners["party"].replace({"無所属": "その他"})
+    winner_parties = _independents_as_others(winners["party"])
 
     # 中道改革連合のSMD議席を立憲民主党と公明党に振り分ける
     # 配分比率: 2024年のSMD実績比を使用（支持率比ではなく）
@@ -1380,7 +1726,7 @@ def save_district_predictions(district_results):
     if district_results.empty:
         return
     out_path = PROCESSED_DIR / "district_model7_results.csv"
-    district_results.to_csv(out_path, index=False, encoding="utf-8-sig")
+    _write_csv(district_results, out_path)
     print(f"  Model 7 選挙区予測結果保存: {out_path}")
 
 
@@ -1430,55 +1776,50 @@ def derive_prefecture_summary(district_results):
 
     df = pd.DataFrame(rows)
     out_path = PROCESSED_DIR / "prefecture_summary.csv"
-    df.to_csv(out_path, index=False, encoding="utf-8-sig")
+    _write_csv(df, out_path)
     print(f"  都道府県集約データ更新: {out_path}")
 
 
 # === CSV出力 ===
 
+def _write_csv(df, out_path):
+    """BOM付きUTF-8でCSVを保存（pyarrow の有無で出力が変わらないよう pandas で書く）"""
+    df.to_csv(out_path, index=False, encoding="utf-8-sig")
+
+
 def save_predictions(m1, m2, m3, m4, m5, m6, m7,
                      eng_scores, sentiment_scores, youtube_shares, blended_shares,
                      news_shares):
     """予測結果をCSVに保存"""
-    rows = []
-    for party in ALL_PARTIES:
-        row = {
-            "party_name": party,
-            "model1_total": m1.get(party, {}).get("total", 0),
-            "model1_smd": m1.get(party, {}).get("smd", 0),
-            "model1_pr": m1.get(party, {}).get("pr", 0),
-            "model2_total": m2.get(party, {}).get("total", 0),
-            "model2_smd": m2.get(party, {}).get("smd", 0),
-            "model2_pr": m2.get(party, {}).get("pr", 0),
-            "model3_total": m3.get(party, {}).get("total", 0),
-            "model3_smd": m3.get(party, {}).get("smd", 0),
-            "model3_pr": m3.get(party, {}).get("pr", 0),
-            "model4_total": m4.get(party, {}).get("total", 0),
-            "model4_smd": m4.get(party, {}).get("smd", 0),
-            "model4_pr": m4.get(party, {}).get("pr", 0),
-            "model5_total": m5.get(party, {}).get("total", 0),
-            "model5_smd": m5.get(party, {}).get("smd", 0),
-            "model5_pr": m5.get(party, {}).get("pr", 0),
-            "model6_total": m6.get(party, {}).get("total", 0),
-            "model6_smd": m6.get(party, {}).get("smd", 0),
-            "model6_pr": m6.get(party, {}).get("pr", 0),
-            "model7_total": m7.get(party, {}).get("total", 0),
-            "model7_smd": m7.get(party, {}).get("smd", 0),
-            "model7_pr": m7.get(party, {}).get("pr", 0),
-            "engagement_score": eng_scores.get(party, 0.0),
-            "sentiment_score": sentiment_scores.get(party, 0.0),
-            "polling_baseline": POLLING_BASELINE.get(party, 0),
-            "polling_baseline_smd": round(POLLING_BASELINE.get(party, 0) * HISTORICAL_SMD_RATIO.get(party, 0.5)),
-            "polling_baseline_pr": POLLING_BASELINE.get(party, 0) - round(POLLING_BASELINE.get(party, 0) * HISTORICAL_SMD_RATIO.get(party, 0.5)),
-            "youtube_share": youtube_shares.get(party, 0.0),
-            "blended_share": blended_shares.get(party, 0.0),
-            "news_share": news_shares.get(party, 0.0),
-        }
-        rows.append(row)
+    n = len(ALL_PARTIES)
 
-    df = pd.DataFrame(rows)
+    def seat_column(results, field):
+        return np.fromiter(
+            (results.get(p, _NO_SEATS).get(field, 0) for p in ALL_PARTIES), dtype=np.int64, count=n
+        )
+
+    def score_column(scores):
+        return np.fromiter((scores.get(p, 0.0) for p in ALL_PARTIES), dtype=float, count=n)
+
+    # 列ごとに配列を作って DataFrame を一括構築する
+    columns = {"party_name": ALL_PARTIES}
+    for i, results in enumerate((m1, m2, m3, m4, m5, m6, m7), start=1):
+        for field in _SEAT_FIELDS:
+            columns[f"model{i}_{field}"] = seat_column(results, field)
+    columns.update({
+        "engagement_score": score_column(eng_scores),
+        "sentiment_score": score_column(sentiment_scores),
+        "polling_baseline": POLLING_BASELINE_VEC.astype(int),
+        "polling_baseline_smd": BASELINE_SMD_VEC,
+        "polling_baseline_pr": BASELINE_PR_VEC,
+        "youtube_share": score_column(youtube_shares),
+        "blended_share": score_column(blended_shares),
+        "news_share": score_column(news_shares),
+    })
+
+    df = pd.DataFrame(columns)
     out_path = PROCESSED_DIR / "seat_predictions.csv"
-    df.to_csv(out_path, index=False, encoding="utf-8-sig")
+    _write_csv(df, out_path)
     print(f"  予測結果保存: {out_path}")
     return df
 
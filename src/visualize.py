@@ -2,62 +2,209 @@
 可視化スクリプト
 分析結果をグラフとして出力する
 """
+import argparse
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
-import matplotlib
-matplotlib.use("Agg")
-
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
+import numpy as np
 import pandas as pd
-import seaborn as sns
-
-plt.rcParams["font.family"] = "Hiragino Sans"
+from PIL import Image
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent))
-from config import PARTY_COLORS
+from config import FIGURE_FORMAT, FIGURE_FORMATS, PARTY_COLORS
 
 OUTPUT_DIR = Path(__file__).parent.parent / "output" / "figures"
 DATA_DIR = Path(__file__).parent.parent / "data" / "processed"
 
-# スタイル設定
-sns.set_theme(style="whitegrid", font_scale=1.2, rc={"font.family": "Hiragino Sans"})
 
+@functools.cache
+def _mpl():
+    """matplotlib / seaborn を初回の描画時に読み込んでスタイルを設定し、(plt, mdates, sns) を返す
+
+    フォントキャッシュやスタイルの初期化が重いため、モジュールの import 時には行わない
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+
+    import matplotlib.pyplot as plt
+    import matplotlib.dates as mdates
+    import seaborn as sns
+    from matplotlib import font_manager
+
+    plt.rcParams["font.family"] = "Hiragino Sans"
+    # スタイル設定
+    sns.set_theme(style="whitegrid", font_scale=1.2, rc={"font.family": "Hiragino Sans"})
+    # フォントを1回だけ解決し、実際に使われるファミリー名に置き換える
+    # （無い環境でもサイズ・太さごとにフォールバック探索を繰り返さない）
+    resolved = font_manager.findfont(font_manager.FontProperties(family="Hiragino Sans"))
+    plt.rcParams["font.family"] = font_manager.FontProperties(fname=resolved).get_name()
+    # 長いパス（fill_between 等）を分割して描画する
+    plt.rcParams["agg.path.chunksize"] = 10000
+    return plt, mdates, sns
+
+
+# 画像の保存設定（画面表示向けの解像度。PNG は速さ優先の zlib 圧縮レベル、
+# WebP は Pillow のエンコーダで PNG より速く小さく書ける）
+SAVE_DPI = 100
+_PIL_KWARGS_BY_FORMAT = {
+    "png": {"compress_level": 1},
+    "webp": {"quality": 85, "method": 4},
+}
+# 出力パスの判定やワーカーでの保存より前に、設定値の誤りをここで止める
+if FIGURE_FORMAT not in FIGURE_FORMATS:
+    raise ValueError(
+        f"FIGURE_FORMAT は {' / '.join(FIGURE_FORMATS)} のいずれかを指定してください（指定値: {FIGURE_FORMAT!r}）"
+    )
+
+# date 列を持つ processed CSV（読み込み時に日付として解釈する）
+_DATE_CSVS = {"daily_video_counts.csv", "daily_views.csv"}
+
+# 描画に使う列と型（型推論を省き、使わない列は読まない。空欄があっても読めるよう数値はすべて float64）
+_CSV_DTYPES = {
+    "daily_video_counts.csv": {"video_count": "float64"},
+    "daily_views.csv": {"view_count": "float64"},
+    "issue_stats.csv": {"issue": "str", "video_count": "float64", "total_views": "float64"},
+    "channel_analysis.csv": {
+        "party_name": "str", "subscriber_count": "float64", "video_count": "float64",
+        "view_count": "float64",
+    },
+    "party_video_stats.csv": {
+        "party_name": "str", "video_count": "float64", "total_views": "float64",
+    },
+    "sentiment_counts.csv": {"sentiment": "str", "count": "float64"},
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _load(name):
+    """processed のCSVを読み込む（同じファイルは1回だけパースする。返す DataFrame は書き換えない）
+
+    列が欠けていても読み込みは失敗させず、その列を使う描画側で失敗させる
+    """
+    dtype = _CSV_DTYPES[name]
+    columns = set(dtype)
+    kwargs = {"usecols": lambda c: c in columns, "dtype": dtype}
+    if name in _DATE_CSVS:
+        columns.add("date")
+        kwargs.update(parse_dates=["date"], date_format="ISO8601")
+    return pd.read_csv(DATA_DIR / name, **kwargs)
+
+
+def _format_man(x, _pos):
+    """目盛りを「万」単位で表示する（軸の set_major_formatter に渡す）"""
+    return f"{x/10000:.0f}万"
+
+
+def _format_oku(x, _pos):
+    """目盛りを「億」単位で表示する"""
+    return f"{x/1e8:.1f}億"
+
+
+def _figure_path(stem):
+    """出力画像のパス（拡張子は FIGURE_FORMAT）"""
+    return OUTPUT_DIR / f"{stem}.{FIGURE_FORMAT}"
+
+
+def _label_colors(labels, color_map, default="#888"):
+    """ラベル列を色のリストに変換する（未定義のラベルは default）"""
+    return labels.map(color_map).fillna(default).tolist()
+
+
+def _single_axes(ax, figsize):
+    """1軸のグラフ用の Figure/Axes を返す
+
+    ax が渡されればその Figure を使い回し（中身を消してサイズを合わせる）、なければ新しく作る
+    """
+    plt, mdates, sns = _mpl()
+    if ax is None:
+        return plt.subplots(figsize=figsize, layout="constrained")
+    ax.clear()
+    ax.figure.set_size_inches(figsize)
+    return ax.figure, ax
+
+
+def _write_figure(fig, path):
+    """Figure を Agg キャンバスに直接描画し、RGBA バッファを Pillow で画像に書き出す
+
+    savefig の出力形式の判定や一時的な dpi・色の差し替えを経由しない
+    """
+    fig.set_dpi(SAVE_DPI)
+    fig.canvas.draw()
+    width, height = fig.canvas.get_width_height()
+    image = Image.frombuffer("RGBA", (width, height), fig.canvas.buffer_rgba(), "raw", "RGBA", 0, 1)
+    image.save(
+        path, format=FIGURE_FORMAT, dpi=(SAVE_DPI, SAVE_DPI),
+        **_PIL_KWARGS_BY_FORMAT[FIGURE_FORMAT],
+    )
+
+
+def _save_single(fig, path, owned):
+    """1軸のグラフを保存し、自前で作った Figure なら閉じる"""
+    plt, mdates, sns = _mpl()
+    _write_figure(fig, path)
+    if owned:
+        plt.close(fig)
+    print(f"  保存: {path.name}")
+
+
+def _moving_average(values, window):
+    """累積和による移動平均（先頭は揃っている分だけで平均する = rolling(min_periods=1)）"""
+    n = len(values)
+    csum = np.concatenate(([0.0], np.cumsum(values)))
+    start = np.maximum(np.arange(n) - (window - 1), 0)
+    return (csum[1:] - csum[start]) / (np.arange(1, n + 1) - start)
 
-def plot_daily_video_trend(df):
-    """日別動画投稿数の推移"""
-    fig, ax = plt.subplots(figsize=(14, 6))
-    df["date"] = pd.to_datetime(df["date"])
 
+def plot_daily_video_trend(df, ax=None):
+    """日別動画投稿数の推移（date 列は読み込み時に日付型にしておく）"""
+    plt, mdates, sns = _mpl()
+    owned = ax is None
+    fig, ax = _single_axes(ax, (14, 6))
     ax.bar(df["date"], df["video_count"], color="#4169E1", alpha=0.7, label="投稿数")
 
     # 移動平均線
     if len(df) >= 3:
-        df["ma3"] = df["video_count"].rolling(3, min_periods=1).mean()
-        ax.plot(df["date"], df["ma3"], color="#DC143C", linewidth=2, label="3日移動平均")
+        ma3 = _moving_average(df["video_count"].to_numpy(dtype=np.float64), 3)
+        ax.plot(df["date"], ma3, color="#DC143C", linewidth=2, label="3日移動平均")
 
     ax.set_title("選挙関連YouTube動画 日別投稿数推移", fontsize=16, fontweight="bold")
     ax.set_xlabel("日付")
     ax.set_ylabel("動画数")
     ax.xaxis.set_major_formatter(mdates.DateFormatter("%m/%d"))
     ax.xaxis.set_major_locator(mdates.DayLocator(interval=3))
-    plt.xticks(rotation=45)
+    plt.setp(ax.get_xticklabels(), rotation=45)
     ax.legend()
-    plt.tight_layout()
 
-    path = OUTPUT_DIR / "01_daily_video_trend.png"
-    fig.savefig(path, dpi=150)
-    plt.close(fig)
-    print(f"  保存: {path.name}")
+    _save_single(fig, _figure_path("01_daily_video_trend"), owned)
 
 
-def plot_daily_views(df):
-    """日別累計再生回数の推移"""
-    fig, ax = plt.subplots(figsize=(14, 6))
-    df["date"] = pd.to_datetime(df["date"])
+# 折れ線・塗りつぶしに渡す点数の上限（超える分は等間隔に間引き、最終日の行は必ず残す）
+_MAX_LINE_POINTS = 1000
 
-    ax.fill_between(df["date"], df["view_count"], alpha=0.3, color="#4169E1")
+
+def plot_daily_views(df, ax=None):
+    """日別累計再生回数の推移（date 列は読み込み時に日付型にしておく）"""
+    plt, mdates, sns = _mpl()
+    owned = ax is None
+    fig, ax = _single_axes(ax, (14, 6))
+
+    # 長期間のデータは切り上げた間隔で間引き、最終日（累計の最終値）を足しても
+    # _MAX_LINE_POINTS + 1 点以内に収める
+    if len(df) > _MAX_LINE_POINTS:
+        step = -(-len(df) // _MAX_LINE_POINTS)
+        positions = np.arange(0, len(df), step)
+        if positions[-1] != len(df) - 1:
+            positions = np.append(positions, len(df) - 1)
+        df = df.iloc[positions]
+
+    # 塗りつぶしはアンチエイリアス・輪郭線なしで描き、頂点ごとの描画コストを抑える
+    ax.fill_between(
+        df["date"], df["view_count"], alpha=0.3, color="#4169E1",
+        antialiased=False, linewidth=0,
+    )
     ax.plot(df["date"], df["view_count"], color="#4169E1", linewidth=2)
 
     ax.set_title("選挙関連動画 日別累計再生回数", fontsize=16, fontweight="bold")
@@ -65,19 +212,16 @@ def plot_daily_views(df):
     ax.set_ylabel("再生回数")
     ax.xaxis.set_major_formatter(mdates.DateFormatter("%m/%d"))
     ax.xaxis.set_major_locator(mdates.DayLocator(interval=3))
-    plt.xticks(rotation=45)
-    ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f"{x/10000:.0f}万"))
-    plt.tight_layout()
+    plt.setp(ax.get_xticklabels(), rotation=45)
+    ax.yaxis.set_major_formatter(_format_man)
 
-    path = OUTPUT_DIR / "02_daily_views.png"
-    fig.savefig(path, dpi=150)
-    plt.close(fig)
-    print(f"  保存: {path.name}")
+    _save_single(fig, _figure_path("02_daily_views"), owned)
 
 
 def plot_issue_comparison(df):
     """争点別の注目度比較"""
-    fig, axes = plt.subplots(1, 2, figsize=(16, 7))
+    plt, mdates, sns = _mpl()
+    fig, axes = plt.subplots(1, 2, figsize=(16, 7), layout="constrained")
 
     # 動画数
     colors = sns.color_palette("Set2", len(df))
@@ -90,39 +234,38 @@ def plot_issue_comparison(df):
     axes[1].barh(df["issue"], df["total_views"], color=colors)
     axes[1].set_title("争点別 総再生回数", fontsize=14, fontweight="bold")
     axes[1].set_xlabel("総再生回数")
-    axes[1].xaxis.set_major_formatter(
-        plt.FuncFormatter(lambda x, _: f"{x/10000:.0f}万")
-    )
+    axes[1].xaxis.set_major_formatter(_format_man)
     axes[1].invert_yaxis()
 
     plt.suptitle(
-        "第51回衆院選 争点別YouTube注目度", fontsize=16, fontweight="bold", y=1.02
+        "第51回衆院選 争点別YouTube注目度", fontsize=16, fontweight="bold"
     )
-    plt.tight_layout()
 
-    path = OUTPUT_DIR / "03_issue_comparison.png"
-    fig.savefig(path, dpi=150, bbox_inches="tight")
+    path = _figure_path("03_issue_comparison")
+    _write_figure(fig, path)
     plt.close(fig)
     print(f"  保存: {path.name}")
 
 
 def plot_party_channel_stats(df):
     """政党チャンネルの統計比較"""
-    df = df.dropna(subset=["party_name"])
+    plt, mdates, sns = _mpl()
+    # 政党名の欠損がある場合だけ行を絞り込む（無ければ複製しない）
+    has_party = df["party_name"].notna()
+    if not has_party.all():
+        df = df[has_party]
     if df.empty:
         print("  政党チャンネルデータなし、スキップ")
         return
 
-    fig, axes = plt.subplots(1, 3, figsize=(18, 6))
+    fig, axes = plt.subplots(1, 3, figsize=(18, 6), layout="constrained")
 
-    colors = [PARTY_COLORS.get(p, "#888") for p in df["party_name"]]
+    colors = _label_colors(df["party_name"], PARTY_COLORS)
 
     # 登録者数
     axes[0].barh(df["party_name"], df["subscriber_count"], color=colors)
     axes[0].set_title("チャンネル登録者数", fontsize=14, fontweight="bold")
-    axes[0].xaxis.set_major_formatter(
-        plt.FuncFormatter(lambda x, _: f"{x/10000:.0f}万")
-    )
+    axes[0].xaxis.set_major_formatter(_format_man)
 
     # 動画数
     axes[1].barh(df["party_name"], df["video_count"], color=colors)
@@ -131,34 +274,32 @@ def plot_party_channel_stats(df):
     # 総再生回数
     axes[2].barh(df["party_name"], df["view_count"], color=colors)
     axes[2].set_title("総再生回数", fontsize=14, fontweight="bold")
-    axes[2].xaxis.set_major_formatter(
-        plt.FuncFormatter(lambda x, _: f"{x/1e8:.1f}億")
-    )
+    axes[2].xaxis.set_major_formatter(_format_oku)
 
     plt.suptitle(
-        "政党公式YouTubeチャンネル比較", fontsize=16, fontweight="bold", y=1.02
+        "政党公式YouTubeチャンネル比較", fontsize=16, fontweight="bold"
     )
-    plt.tight_layout()
 
-    path = OUTPUT_DIR / "04_party_channels.png"
-    fig.savefig(path, dpi=150, bbox_inches="tight")
+    path = _figure_path("04_party_channels")
+    _write_figure(fig, path)
     plt.close(fig)
     print(f"  保存: {path.name}")
 
 
 def plot_party_video_performance(df):
     """政党別の動画パフォーマンス"""
+    plt, mdates, sns = _mpl()
     if df.empty:
         print("  政党動画データなし、スキップ")
         return
 
-    fig, ax = plt.subplots(figsize=(12, 7))
-    colors = [PARTY_COLORS.get(p, "#888") for p in df["party_name"]]
+    fig, ax = plt.subplots(figsize=(12, 7), layout="constrained")
+    colors = _label_colors(df["party_name"], PARTY_COLORS)
 
-    x = range(len(df))
+    x = np.arange(len(df))
     width = 0.35
     bars1 = ax.bar(
-        [i - width / 2 for i in x],
+        x - width / 2,
         df["total_views"],
         width,
         label="総再生回数",
@@ -167,7 +308,7 @@ def plot_party_video_performance(df):
     )
     ax2 = ax.twinx()
     bars2 = ax2.bar(
-        [i + width / 2 for i in x],
+        x + width / 2,
         df["video_count"],
         width,
         label="動画数",
@@ -180,7 +321,7 @@ def plot_party_video_performance(df):
     ax.set_xticklabels(df["party_name"], rotation=30, ha="right")
     ax.set_ylabel("総再生回数")
     ax2.set_ylabel("動画数")
-    ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f"{x/10000:.0f}万"))
+    ax.yaxis.set_major_formatter(_format_man)
 
     ax.set_title(
         "政党別 選挙期間中の動画パフォーマンス", fontsize=16, fontweight="bold"
@@ -190,20 +331,19 @@ def plot_party_video_performance(df):
     lines2, labels2 = ax2.get_legend_handles_labels()
     ax.legend(lines1 + lines2, labels1 + labels2, loc="upper right")
 
-    plt.tight_layout()
-
-    path = OUTPUT_DIR / "05_party_performance.png"
-    fig.savefig(path, dpi=150)
+    path = _figure_path("05_party_performance")
+    _write_figure(fig, path)
     plt.close(fig)
     print(f"  保存: {path.name}")
 
 
 def plot_sentiment(df):
     """コメント感情分析の結果"""
-    fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+    plt, mdates, sns = _mpl()
+    fig, axes = plt.subplots(1, 2, figsize=(14, 6), layout="constrained")
 
     colors_map = {"positive": "#2ECC71", "neutral": "#95A5A6", "negative": "#E74C3C"}
-    colors = [colors_map.get(s, "#888") for s in df["sentiment"]]
+    colors = _label_colors(df["sentiment"], colors_map)
 
     # 円グラフ
     axes[0].pie(
@@ -222,25 +362,30 @@ def plot_sentiment(df):
     axes[1].set_ylabel("コメント数")
 
     plt.suptitle(
-        "選挙関連動画コメントの感情分析", fontsize=16, fontweight="bold", y=1.02
+        "選挙関連動画コメントの感情分析", fontsize=16, fontweight="bold"
     )
-    plt.tight_layout()
 
-    path = OUTPUT_DIR / "06_sentiment.png"
-    fig.savefig(path, dpi=150, bbox_inches="tight")
+    path = _figure_path("06_sentiment")
+    _write_figure(fig, path)
     plt.close(fig)
     print(f"  保存: {path.name}")
 
 
-def plot_top_videos(df_details, top_n=15):
+def plot_top_videos(df_details, top_n=15, ax=None):
     """再生回数トップ動画"""
-    df = pd.read_csv(df_details) if isinstance(df_details, (str, Path)) else df_details
+    plt, mdates, sns = _mpl()
+    if isinstance(df_details, (str, Path)):
+        df = pd.read_csv(df_details, usecols=["title", "view_count"])
+    else:
+        df = df_details
     df = df.nlargest(top_n, "view_count")
 
-    fig, ax = plt.subplots(figsize=(14, 8))
+    owned = ax is None
+    fig, ax = _single_axes(ax, (14, 8))
 
     # タイトルを短縮
-    labels = [t[:30] + "..." if len(str(t)) > 30 else str(t) for t in df["title"]]
+    titles = df["title"].astype(str)
+    labels = titles.where(titles.str.len() <= 30, titles.str.slice(0, 30) + "...").tolist()
     colors = sns.color_palette("viridis", len(df))
 
     ax.barh(range(len(df)), df["view_count"], color=colors)
@@ -251,73 +396,144 @@ def plot_top_videos(df_details, top_n=15):
         f"再生回数トップ{top_n}動画", fontsize=16, fontweight="bold"
     )
     ax.set_xlabel("再生回数")
-    ax.xaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f"{x/10000:.0f}万"))
+    ax.xaxis.set_major_formatter(_format_man)
 
-    plt.tight_layout()
+    _save_single(fig, _figure_path("07_top_videos"), owned)
 
-    path = OUTPUT_DIR / "07_top_videos.png"
-    fig.savefig(path, dpi=150)
+
+def _plot_from_csv(name, plot, **kwargs):
+    """processed のCSVを読み込んで描画する（ファイルがない・読めなければスキップ）"""
+    try:
+        df = _load(name)
+    except FileNotFoundError:
+        print(f"  {name} が見つかりません、スキップ")
+        return
+    except ValueError as e:
+        print(f"  {name} を読み込めません（{e}）、スキップ")
+        return
+    plot(df, **kwargs)
+
+
+def _newest_video_details():
+    """raw の video_details_*.csv のうち最新（ファイル名が最大）のもの（なければ None）"""
+    raw_dir = Path(__file__).parent.parent / "data" / "raw"
+    # 最新のものだけを使うので整列せず max で選ぶ
+    return max(raw_dir.glob("video_details_*.csv"), key=lambda f: f.name, default=None)
+
+
+def _job_single_axes_plots(keys):
+    """1軸のグラフ（01・02・07 のうち keys のもの）を1つの Figure を使い回して描画する"""
+    plt, mdates, sns = _mpl()
+    fig, ax = plt.subplots(figsize=(14, 6), layout="constrained")
+    if "daily" in keys:
+        _plot_from_csv("daily_video_counts.csv", plot_daily_video_trend, ax=ax)
+    if "views" in keys:
+        _plot_from_csv("daily_views.csv", plot_daily_views, ax=ax)
+    if "top" in keys:
+        try:
+            newest = _newest_video_details()
+            if newest is not None:
+                plot_top_videos(newest, ax=ax)
+        except FileNotFoundError:
+            print("  video_details が見つかりません、スキップ")
+        except ValueError as e:
+            print(f"  video_details を読み込めません（{e}）、スキップ")
     plt.close(fig)
-    print(f"  保存: {path.name}")
 
 
-def create_all_visualizations():
-    """全可視化を実行"""
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+def _job_issue_comparison():
+    _plot_from_csv("issue_stats.csv", plot_issue_comparison)
 
-    print("=" * 60)
-    print("可視化を実行中...")
-    print("=" * 60)
 
-    try:
-        daily_counts = pd.read_csv(DATA_DIR / "daily_video_counts.csv")
-        plot_daily_video_trend(daily_counts)
-    except FileNotFoundError:
-        print("  daily_video_counts.csv が見つかりません、スキップ")
+def _job_party_channels():
+    _plot_from_csv("channel_analysis.csv", plot_party_channel_stats)
 
-    try:
-        daily_views = pd.read_csv(DATA_DIR / "daily_views.csv")
-        plot_daily_views(daily_views)
-    except FileNotFoundError:
-        print("  daily_views.csv が見つかりません、スキップ")
 
-    try:
-        issue_stats = pd.read_csv(DATA_DIR / "issue_stats.csv")
-        plot_issue_comparison(issue_stats)
-    except FileNotFoundError:
-        print("  issue_stats.csv が見つかりません、スキップ")
+def _job_party_performance():
+    _plot_from_csv("party_video_stats.csv", plot_party_video_performance)
 
-    try:
-        channel_stats = pd.read_csv(DATA_DIR / "channel_analysis.csv")
-        plot_party_channel_stats(channel_stats)
-    except FileNotFoundError:
-        print("  channel_analysis.csv が見つかりません、スキップ")
 
-    try:
-        party_stats = pd.read_csv(DATA_DIR / "party_video_stats.csv")
-        plot_party_video_performance(party_stats)
-    except FileNotFoundError:
-        print("  party_video_stats.csv が見つかりません、スキップ")
+def _job_sentiment():
+    _plot_from_csv("sentiment_counts.csv", plot_sentiment)
 
-    try:
-        sentiment = pd.read_csv(DATA_DIR / "sentiment_counts.csv")
-        plot_sentiment(sentiment)
-    except FileNotFoundError:
-        print("  sentiment_counts.csv が見つかりません、スキップ")
 
-    try:
-        from pathlib import Path as P
-        raw_dir = Path(__file__).parent.parent / "data" / "raw"
-        files = sorted(raw_dir.glob("video_details_*.csv"), reverse=True)
-        if files:
-            plot_top_videos(files[0])
-    except FileNotFoundError:
-        print("  video_details が見つかりません、スキップ")
+# グラフごとの入力CSV（processed 配下。top は raw の最新 video_details）と出力ファイル名
+_PLOTS = {
+    "daily": ("daily_video_counts.csv", "01_daily_video_trend"),
+    "views": ("daily_views.csv", "02_daily_views"),
+    "issue": ("issue_stats.csv", "03_issue_comparison"),
+    "channels": ("channel_analysis.csv", "04_party_channels"),
+    "party": ("party_video_stats.csv", "05_party_performance"),
+    "sentiment": ("sentiment_counts.csv", "06_sentiment"),
+    "top": (None, "07_top_videos"),
+}
+
+# 1つの Figure を使い回すグラフと、個別の Figure で描く（互いに独立した）ジョブ
+_SINGLE_AXES_PLOTS = ("daily", "views", "top")
+_MULTI_AXES_JOBS = {
+    "issue": _job_issue_comparison,
+    "channels": _job_party_channels,
+    "party": _job_party_performance,
+    "sentiment": _job_sentiment,
+}
+
+
+def _is_up_to_date(key):
+    """出力画像が入力CSVより新しければ True（入力・出力のどちらかが無ければ False）"""
+    name, stem = _PLOTS[key]
+    input_path = _newest_video_details() if name is None else DATA_DIR / name
+    output_path = _figure_path(stem)
+    if input_path is None or not input_path.exists() or not output_path.exists():
+        return False
+    return output_path.stat().st_mtime >= input_path.stat().st_mtime
+
+
+def create_all_visualizations(only=None, force=False):
+    """全可視化を実行（独立した描画ジョブをプロセスプールで並列に実行）
+
+    only: 描画するグラフのキー（_PLOTS のキー。None なら全て）
+    force: False なら出力画像が入力CSVより新しいグラフは描き直さない
+    """
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+    print("=" * 60)
+    print("可視化を実行中...")
+    print("=" * 60)
+
+    keys = [only] if only is not None else list(_PLOTS)
+    if not force:
+        for key in [k for k in keys if _is_up_to_date(k)]:
+            print(f"  {_PLOTS[key][1]} は入力より新しいため、スキップ")
+            keys.remove(key)
+
+    jobs = [(job,) for key, job in _MULTI_AXES_JOBS.items() if key in keys]
+    single = [key for key in _SINGLE_AXES_PLOTS if key in keys]
+    if single:
+        jobs.insert(0, (_job_single_axes_plots, single))
+
+    if jobs:
+        # fork したワーカーが未出力のバッファを複製しないよう先に書き出す
+        sys.stdout.flush()
+        max_workers = min(len(jobs), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(*job) for job in jobs]
+            for future in as_completed(futures):
+                future.result()
 
     print("\n可視化完了!")
     print(f"出力先: {OUTPUT_DIR}")
     print("=" * 60)
 
 
+def main():
+    parser = argparse.ArgumentParser(description="分析結果をグラフとして出力する")
+    parser.add_argument("--only", choices=list(_PLOTS), help="指定したグラフだけを描画する")
+    parser.add_argument(
+        "--force", action="store_true", help="出力画像が入力より新しくても描き直す",
+    )
+    args = parser.parse_args()
+    create_all_visualizations(only=args.only, force=args.force)
+
+
 if __name__ == "__main__":
-    create_all_visualizations()
+    main()